@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Offline harness driving MusicCog without Discord or YouTube.
+
+Pieces:
+    StubYouTubeDownloader  YouTubeDownloader answering from generated metadata
+                           after a configurable (blocking) latency, so the
+                           worker pool, scheduler and prefetcher still run
+    FixtureSourceFactory   replaces cog.audio_sources; every track plays a
+                           local WAV fixture instead of an FFmpeg process
+    FakeVoiceClient        consumes 20 ms frames on its own thread, like the
+                           discord.py audio player, optionally faster than
+                           real time, and calls after= when the source ends
+    FakeContext & co.      just enough of commands.Context, Member, Guild and
+                           channels for the commands to run
+
+OfflineHarness builds the cog in a temporary working directory, so caches,
+playlists and logs of a run never touch the real ones.
+"""
+
+import os
+import sys
+import math
+import time
+import wave
+import random
+import shutil
+import asyncio
+import hashlib
+import tempfile
+import types
+import threading
+import contextlib
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import discord as dc
+from music.youtube_downloader import YouTubeDownloader
+from config import BotConfig
+
+FRAME_SECONDS = 0.02  # discord.py sends one 20 ms frame per packet
+SAMPLE_RATE = 48000
+CHANNELS = 2
+FRAME_SAMPLES = int(SAMPLE_RATE * FRAME_SECONDS)
+
+def write_fixture(path: str, seconds: float) -> str:
+    """Write a 440 Hz stereo 16-bit 48 kHz WAV file and return its path."""
+    samples = array("h")
+    for i in range(int(SAMPLE_RATE * seconds)):
+        value = int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE))
+        samples.extend((value, value))
+    if sys.byteorder == "big":
+        samples.byteswap()
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(CHANNELS)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+    return path
+
+def percentiles(values: Iterable[float], points: Tuple[int, ...] = (50, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles plus max; empty input gives an empty dict."""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    result = {
+        f"p{point}": ordered[min(len(ordered) - 1, max(0, math.ceil(point / 100 * len(ordered)) - 1))]
+        for point in points
+    }
+    result["max"] = ordered[-1]
+    return result
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+
+class StubYouTubeDownloader(YouTubeDownloader):
+    """
+    YouTubeDownloader that never touches the network.
+
+    Every extraction sleeps for `latency` (+- `jitter` share of it) on the
+    calling worker thread and returns metadata derived from the URL or
+    query, so identical inputs always map to the same video. Resolved infos
+    point at the fixture through a fixture:// media URL.
+    """
+
+    def __init__(
+        self,
+        duration: int,
+        latency: float = 0.05,
+        jitter: float = 0.5,
+        playlist_size: int = 50,
+        seed: int = 0
+    ):
+        super().__init__()
+        self.duration = duration
+        self.latency = latency
+        self.jitter = jitter
+        self.playlist_size = playlist_size
+        self.random = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+        self._calls_lock = threading.Lock()
+
+    def _call(self, name: str) -> None:
+        """Count call and block like yt-dlp would."""
+        with self._calls_lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            delay = self.latency * self.random.uniform(1 - self.jitter, 1 + self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _video_id(self, url_or_query: str) -> str:
+        """Video ID from link, or a stable fake one for a query."""
+        return self.get_video_id(url_or_query) or hashlib.md5(url_or_query.encode()).hexdigest()[:11]
+
+    def _entry(self, video_id: str) -> Dict[str, Any]:
+        """Flat entry as returned by searches and playlist enumeration."""
+        return {
+            "_type": "url",
+            "ie_key": "Youtube",
+            "id": video_id,
+            "title": f"Fixture {video_id}",
+            "uploader": "Fixture Channel",
+            "duration": self.duration,
+            "webpage_url": f"{BotConfig.YOUTUBE_BASE_URL}{video_id}",
+            "url": f"{BotConfig.YOUTUBE_BASE_URL}{video_id}",
+        }
+
+    def _info(self, video_id: str) -> Dict[str, Any]:
+        """Format-resolved info with a playable (fixture) media URL."""
+        info = self._entry(video_id)
+        del info["_type"], info["ie_key"]
+        info.update(format_id="251", acodec="opus", vcodec="none", url=f"fixture://{video_id}")
+        return info
+
+    def extract_info(self, url: str, download: bool = True, process: bool = True) -> Optional[Dict[str, Any]]:
+        self._call("extract_info")
+        return self._info(self._video_id(url))
+
+    def search_youtube(self, query: str, max_results: int = 1) -> Optional[List[Dict[str, Any]]]:
+        self._call("search_youtube")
+        return [self._entry(self._video_id(f"{query}#{i}")) for i in range(max_results)]
+
+    def get_track_info(self, url_or_query: str, download: bool = True) -> Optional[Dict[str, Any]]:
+        self._call("get_track_info")
+        return self._info(self._video_id(url_or_query))
+
+    def get_playlist_entries(self, url: str, limit: int) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        self._call("get_playlist_entries")
+        count = min(limit, self.playlist_size)
+        return [self._entry(self._video_id(f"{url}#{i}")) for i in range(count)], self.playlist_size
+
+class FixtureAudioSource(dc.AudioSource):
+    """PCM source reading 20 ms frames from the WAV fixture."""
+
+    def __init__(self, path: str):
+        self.file = wave.open(path, "rb")
+
+    def read(self) -> bytes:
+        data = self.file.readframes(FRAME_SAMPLES)
+        # Like FFmpegPCMAudio: a short read means the stream is over
+        return data if len(data) == FRAME_SAMPLES * CHANNELS * 2 else b""
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self) -> None:
+        self.file.close()
+
+class FixtureSourceFactory:
+    """Stands in for AudioSourceFactory: every track plays the fixture."""
+
+    def __init__(self, fixture_path: str):
+        self.fixture_path = fixture_path
+        self.stats: Dict[str, int] = {"fixture": 0}
+
+    async def create(
+        self,
+        source: str,
+        ffmpeg_opts: Dict[str, str],
+        codec: Optional[str] = None,
+        volume: float = 1.0
+    ) -> dc.AudioSource:
+        self.stats["fixture"] += 1
+        return FixtureAudioSource(self.fixture_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+@dataclass
+class PlayRecord:
+    """One voice_client.play() call, timestamps from time.perf_counter()."""
+
+    started: float
+    first_frame: Optional[float] = None
+    ended: Optional[float] = None
+    frames: int = 0
+    late_frames: int = 0
+
+class FakeVoiceClient:
+    """
+    Voice client whose player thread reads one frame every 20 ms / speed.
+
+    A frame read more than one frame interval after its deadline counts as
+    late, which is what listeners would hear as a stutter.
+    """
+
+    def __init__(self, guild: "FakeGuild", channel: "FakeVoiceChannel", speed: float):
+        self.guild = guild
+        self.channel = channel
+        self.interval = FRAME_SECONDS / speed
+        self.connected = True
+        self._thread: Optional[threading.Thread] = None
+        self._end = threading.Event()
+        self._resumed = threading.Event()
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def is_playing(self) -> bool:
+        return self._thread is not None and self._resumed.is_set() and not self._end.is_set()
+
+    def is_paused(self) -> bool:
+        return self._thread is not None and not self._resumed.is_set() and not self._end.is_set()
+
+    def play(self, source: dc.AudioSource, *, after: Any = None) -> None:
+        if not self.connected:
+            raise dc.ClientException("Not connected to voice.")
+        if self.is_playing():
+            raise dc.ClientException("Already playing audio.")
+
+        record = PlayRecord(started=time.perf_counter())
+        self.guild.plays.append(record)
+        self._end = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._thread = threading.Thread(
+            target=self._run, args=(source, after, record, self._end, self._resumed),
+            name=f"fake-voice-{self.guild.id}", daemon=True
+        )
+        self._thread.start()
+
+    def pause(self) -> None:
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        self._resumed.set()
+
+    def stop(self) -> None:
+        self._end.set()
+        self._resumed.set()
+
+    async def disconnect(self, *, force: bool = False) -> None:
+        self.stop()
+        self.connected = False
+        self.guild.voice_client = None
+        if self in self.guild.bot.voice_clients:
+            self.guild.bot.voice_clients.remove(self)
+
+    def _run(
+        self,
+        source: dc.AudioSource,
+        after: Any,
+        record: PlayRecord,
+        end: threading.Event,
+        resumed: threading.Event
+    ) -> None:
+        """Player thread: pace frames against absolute deadlines."""
+        start = time.perf_counter()
+        loops = 0
+        try:
+            while not end.is_set():
+                if not resumed.is_set():
+                    resumed.wait()
+                    start, loops = time.perf_counter(), 0
+                    continue
+
+                data = source.read()
+                if not data:
+                    break
+
+                now = time.perf_counter()
+                if record.first_frame is None:
+                    record.first_frame = now
+                    self.guild.notify_started()
+                if now - (start + loops * self.interval) > self.interval:
+                    record.late_frames += 1
+                record.frames += 1
+                loops += 1
+
+                delay = start + loops * self.interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            record.ended = time.perf_counter()
+            end.set()
+            source.cleanup()
+            if after is not None:
+                after(None)
+
+class FakeVoiceChannel:
+    def __init__(self, guild: "FakeGuild"):
+        self.guild = guild
+        self.id = guild.id * 10
+
+    async def connect(self, **kwargs: Any) -> FakeVoiceClient:
+        voice_client = FakeVoiceClient(self.guild, self, self.guild.bot.speed)
+        self.guild.voice_client = voice_client
+        self.guild.bot.voice_clients.append(voice_client)
+        return voice_client
+
+class FakeMessage:
+    def __init__(self, content: Optional[str] = None, embed: Optional[dc.Embed] = None):
+        self.content = content
+        self.embed = embed
+
+    async def edit(self, *, content: Optional[str] = None, embed: Optional[dc.Embed] = None, **kwargs: Any) -> "FakeMessage":
+        self.content = content if content is not None else self.content
+        self.embed = embed if embed is not None else self.embed
+        return self
+
+class FakeTextChannel:
+    def __init__(self, guild: "FakeGuild"):
+        self.guild = guild
+        self.sent = 0
+
+    async def purge(self, **kwargs: Any) -> list:
+        return []
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[dc.Embed] = None, **kwargs: Any) -> FakeMessage:
+        self.sent += 1
+        if self.guild.bot.api_latency:
+            await asyncio.sleep(self.guild.bot.api_latency)
+        return FakeMessage(content, embed)
+
+class FakeMember:
+    def __init__(self, guild: "FakeGuild", user_id: int, in_voice: bool = True):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+        self.name = self.display_name
+        self.guild = guild
+        self.bot = False
+        self.voice = types.SimpleNamespace(channel=guild.voice_channel) if in_voice else None
+        self.guild_permissions = dc.Permissions.none()
+
+class FakeGuild:
+    """Guild with one text and one voice channel; collects its playback records."""
+
+    def __init__(self, bot: "FakeBot", guild_id: int):
+        self.bot = bot
+        self.id = guild_id
+        self.name = f"guild{guild_id}"
+        self.voice_client: Optional[FakeVoiceClient] = None
+        self.voice_channel = FakeVoiceChannel(self)
+        self.text_channel = FakeTextChannel(self)
+        self.plays: List[PlayRecord] = []
+        self.first_request: Optional[float] = None
+        self._started = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+    def member(self, index: int = 0) -> FakeMember:
+        """Member in the guild's voice channel; IDs are unique across guilds."""
+        return FakeMember(self, self.id * 1000 + index)
+
+    def context(self, member: FakeMember) -> "FakeContext":
+        return FakeContext(self, member)
+
+    def notify_started(self) -> None:
+        """Player thread: a track produced its first frame."""
+        self._loop.call_soon_threadsafe(self._started.set)
+
+    async def wait_for_plays(self, count: int) -> None:
+        """Wait until count tracks have produced audio."""
+        while sum(1 for play in self.plays if play.first_frame is not None) < count:
+            await self._started.wait()
+            self._started.clear()
+
+    def time_to_first_audio(self) -> Optional[float]:
+        """Seconds from first request until the first frame was played."""
+        for play in self.plays:
+            if play.first_frame is not None and self.first_request is not None:
+                return play.first_frame - self.first_request
+        return None
+
+    def gaps(self) -> List[float]:
+        """Silence between the end of one track and the first frame of the next."""
+        return [
+            current.first_frame - previous.ended
+            for previous, current in zip(self.plays, self.plays[1:])
+            if previous.ended is not None and current.first_frame is not None
+        ]
+
+    def late_frames(self) -> int:
+        return sum(play.late_frames for play in self.plays)
+
+class FakeContext:
+    """The parts of commands.Context the music commands use."""
+
+    def __init__(self, guild: FakeGuild, author: FakeMember):
+        self.bot = guild.bot
+        self.guild = guild
+        self.author = author
+        self.channel = guild.text_channel
+        self.message = types.SimpleNamespace(author=author, guild=guild, channel=self.channel)
+        self.command = None
+
+    @property
+    def voice_client(self) -> Optional[FakeVoiceClient]:
+        return self.guild.voice_client
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        return await self.channel.send(content, **kwargs)
+
+class FakeBot:
+    """Bot stand-in; speed and api_latency are shared by all fake guilds."""
+
+    def __init__(self, speed: float, api_latency: float):
+        self.speed = speed
+        self.api_latency = api_latency
+        self.voice_clients: List[FakeVoiceClient] = []
+
+class OfflineHarness:
+    """
+    MusicCog wired to the fakes, used as an async context manager.
+
+    Command latencies and failures are recorded per command name by
+    invoke(). Logger output is swallowed unless verbose is set.
+    """
+
+    def __init__(
+        self,
+        fixture_seconds: float = 3.0,
+        latency: float = 0.05,
+        jitter: float = 0.5,
+        speed: float = 1.0,
+        api_latency: float = 0.0,
+        seed: int = 0,
+        verbose: bool = False
+    ):
+        self.fixture_seconds = fixture_seconds
+        self.latency = latency
+        self.jitter = jitter
+        self.speed = speed
+        self.api_latency = api_latency
+        self.seed = seed
+        self.verbose = verbose
+
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.guilds: List[FakeGuild] = []
+
+    async def __aenter__(self) -> "OfflineHarness":
+        self._cwd = os.getcwd()
+        self._tmpdir = tempfile.mkdtemp(prefix="musicbot-bench-")
+        self._stdout = contextlib.ExitStack()
+        if not self.verbose:
+            devnull = self._stdout.enter_context(open(os.devnull, "w"))
+            self._stdout.enter_context(contextlib.redirect_stdout(devnull))
+        # Every relative path in BotConfig now resolves inside the temp dir
+        os.chdir(self._tmpdir)
+
+        # Imported late: MusicCog pulls in optional packages such as lyricsgenius
+        from cogs.MusicCog import MusicCog
+
+        fixture = write_fixture(os.path.join(self._tmpdir, "fixture.wav"), self.fixture_seconds)
+        self.downloader = StubYouTubeDownloader(
+            max(1, int(self.fixture_seconds)), self.latency, self.jitter, seed=self.seed
+        )
+        self.bot = FakeBot(self.speed, self.api_latency)
+        self.cog = MusicCog(self.bot, downloader=self.downloader)
+        self.cog.audio_sources = FixtureSourceFactory(fixture)
+        # Benchmarks fire commands back to back
+        self.cog.rate_limiter.cooldown_time = 0
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        try:
+            for voice_client in list(self.bot.voice_clients):
+                await voice_client.disconnect()
+            await self.cog.cog_unload()
+        finally:
+            os.chdir(self._cwd)
+            self._stdout.close()
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def add_guild(self) -> FakeGuild:
+        guild = FakeGuild(self.bot, len(self.guilds) + 1)
+        self.guilds.append(guild)
+        return guild
+
+    async def invoke(self, ctx: FakeContext, command: str, *args: Any, **kwargs: Any) -> float:
+        """
+        Run cog command like the bot would after parsing arguments.
+
+        Returns:
+            Command latency in seconds
+        """
+        callback = getattr(self.cog, command).callback
+        started = time.perf_counter()
+        try:
+            await callback(self.cog, ctx, *args, **kwargs)
+        except Exception as e:
+            self.errors[command] = self.errors.get(command, 0) + 1
+            if self.verbose:
+                print(f"{command} failed: {e!r}", file=sys.stderr)
+        elapsed = time.perf_counter() - started
+        self.latencies.setdefault(command, []).append(elapsed)
+        return elapsed
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Load simulator: how many concurrent guilds does MusicCog sustain?
+
+Runs steps of N simulated guilds (N = --start, then multiplied by --factor)
+against the offline harness from benchmarks.harness, each step on a fresh
+cog. Every guild keeps a session going for --duration seconds: members
+issue a random mix of +play, +skip, +queue, +saveplaylist, +loadplaylist
+and +playlists with exponential think times, picking songs from a catalog
+shared by all guilds (so requests coalesce and cached tracks are shared
+like on a real bot). Audio plays in real time unless --speed says
+otherwise.
+
+A step fails its SLOs when any of these is exceeded:
+    p95 latency of +play                     --slo-play-ms
+    p95 latency of every other command       --slo-command-ms
+    p99 event loop lag                       --slo-lag-ms
+    share of late audio frames               --slo-late-frames
+
+The ramp stops at the first failing step or at --max guilds. Per step it
+reports throughput, latencies, event loop lag, RSS growth per guild, late
+frames and thread count.
+
+Run from the repository root:
+    python -m benchmarks.load_sim
+    python -m benchmarks.load_sim --start 50 --max 2000 --duration 30
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from benchmarks.harness import OfflineHarness, FakeGuild, percentiles, rss_bytes
+
+# (command, weight) of what members do once music is playing
+COMMAND_MIX: List[Tuple[str, int]] = [
+    ("play_music", 40),
+    ("show_queue", 25),
+    ("skip_track", 12),
+    ("list_playlists", 10),
+    ("save_playlist", 5),
+    ("load_playlist", 5),
+    ("toggle_auto_dj", 3),
+]
+MEMBERS_PER_GUILD = 4
+CATALOG_SIZE = 500
+LAG_INTERVAL = 0.05
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--start", type=int, default=5, help="guilds in the first step")
+    parser.add_argument("--factor", type=float, default=2.0, help="guild multiplier between steps")
+    parser.add_argument("--max", type=int, default=5000, help="stop ramping after this many guilds")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds every step runs")
+    parser.add_argument("--think", type=float, default=3.0, help="mean seconds between a guild's commands")
+    parser.add_argument("--latency", type=float, default=0.2, help="stub extraction latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="latency jitter as a share of --latency")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed-up (1 = real time)")
+    parser.add_argument("--fixture-seconds", type=float, default=8.0, help="length of every track")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="delay of every message send")
+    parser.add_argument("--slo-play-ms", type=float, default=3000.0)
+    parser.add_argument("--slo-command-ms", type=float, default=250.0)
+    parser.add_argument("--slo-lag-ms", type=float, default=100.0)
+    parser.add_argument("--slo-late-frames", type=float, default=0.01, help="allowed share of late frames")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="show bot logs and command failures")
+    return parser.parse_args()
+
+async def measure_lag(samples: List[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up a sleeping task."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(time.perf_counter() - started - LAG_INTERVAL)
+
+async def guild_session(
+    harness: OfflineHarness,
+    guild: FakeGuild,
+    rng: random.Random,
+    deadline: float,
+    think: float
+) -> None:
+    """One guild: start the music, then issue random commands until deadline."""
+    members = [guild.member(i) for i in range(MEMBERS_PER_GUILD)]
+    commands, weights = zip(*COMMAND_MIX)
+
+    # Spread session starts over the first think interval
+    await asyncio.sleep(rng.uniform(0, think))
+    guild.first_request = time.perf_counter()
+    await harness.invoke(guild.context(members[0]), "play_music", url=f"song {rng.randrange(CATALOG_SIZE)}")
+
+    while True:
+        pause = rng.expovariate(1 / think)
+        if time.perf_counter() + pause >= deadline:
+            return
+        await asyncio.sleep(pause)
+
+        ctx = guild.context(rng.choice(members))
+        command = rng.choices(commands, weights)[0]
+        if command == "play_music":
+            await harness.invoke(ctx, command, url=f"song {rng.randrange(CATALOG_SIZE)}")
+        elif command in ("save_playlist", "load_playlist"):
+            await harness.invoke(ctx, command, f"sim{rng.randrange(3)}")
+        elif command == "toggle_auto_dj":
+            await harness.invoke(ctx, command, rng.random() < 0.8)
+        else:
+            await harness.invoke(ctx, command)
+
+async def run_step(args: argparse.Namespace, guild_count: int) -> Dict[str, Any]:
+    """Run one step on a fresh cog and collect its measurements."""
+    harness = OfflineHarness(
+        fixture_seconds=args.fixture_seconds,
+        latency=args.latency,
+        jitter=args.jitter,
+        speed=args.speed,
+        api_latency=args.api_latency,
+        seed=args.seed,
+        verbose=args.verbose
+    )
+    rng = random.Random(args.seed)
+    lag: List[float] = []
+    stop = asyncio.Event()
+
+    async with harness:
+        # Cog construction is a fixed cost, only guild state counts
+        rss_before = rss_bytes()
+        guilds = [harness.add_guild() for _ in range(guild_count)]
+        lag_task = asyncio.create_task(measure_lag(lag, stop))
+
+        cpu_before = time.process_time()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            guild_session(harness, guild, random.Random(rng.random()), deadline, args.think)
+            for guild in guilds
+        ))
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu_before
+
+        # Sample while every guild still holds its queue and voice client
+        rss_growth = rss_bytes() - rss_before
+        threads = threading.active_count()
+        stop.set()
+        await lag_task
+
+    play = harness.latencies.get("play_music", [])
+    others = [value for command, values in harness.latencies.items() if command != "play_music" for value in values]
+    frames = sum(record.frames for guild in guilds for record in guild.plays)
+    late = sum(guild.late_frames() for guild in guilds)
+    ttfa = [value for value in (guild.time_to_first_audio() for guild in guilds) if value is not None]
+
+    return {
+        "guilds": guild_count,
+        "commands_per_s": sum(len(values) for values in harness.latencies.values()) / wall,
+        "errors": sum(harness.errors.values()),
+        "play": percentiles(play),
+        "command": percentiles(others),
+        "ttfa": percentiles(ttfa),
+        "lag": percentiles(lag),
+        "late_share": late / frames if frames else 0.0,
+        "frames": frames,
+        "rss_per_guild": rss_growth / guild_count,
+        "cpu_share": cpu / wall,
+        "threads": threads,
+    }
+
+def check_slos(args: argparse.Namespace, step: Dict[str, Any]) -> List[str]:
+    """Get names of SLOs the step broke."""
+    broken = []
+    if step["play"].get("p95", 0) * 1000 > args.slo_play_ms:
+        broken.append("play p95")
+    if step["command"].get("p95", 0) * 1000 > args.slo_command_ms:
+        broken.append("command p95")
+    if step["lag"].get("p99", 0) * 1000 > args.slo_lag_ms:
+        broken.append("loop lag p99")
+    if step["late_share"] > args.slo_late_frames:
+        broken.append("late frames")
+    return broken
+
+def ms(stats: Dict[str, float], point: str) -> str:
+    value: Optional[float] = stats.get(point)
+    return f"{value * 1000:.0f}" if value is not None else "-"
+
+def print_header() -> None:
+    print(
+        f"{'guilds':>7} {'cmd/s':>7} {'play p95':>9} {'cmd p95':>8} {'ttfa p95':>9} "
+        f"{'lag p99':>8} {'late':>7} {'KiB/guild':>10} {'CPU':>5} {'threads':>8}  result",
+        flush=True
+    )
+
+def print_step(step: Dict[str, Any], broken: List[str]) -> None:
+    result = "FAIL: " + ", ".join(broken) if broken else "ok"
+    if step["errors"]:
+        result += f" ({step['errors']} command errors)"
+    print(
+        f"{step['guilds']:>7} {step['commands_per_s']:>7.1f} {ms(step['play'], 'p95'):>9} "
+        f"{ms(step['command'], 'p95'):>8} {ms(step['ttfa'], 'p95'):>9} {ms(step['lag'], 'p99'):>8} "
+        f"{step['late_share']:>7.2%} {step['rss_per_guild'] / 1024:>10.0f} {step['cpu_share']:>5.0%} "
+        f"{step['threads']:>8}  {result}",
+        flush=True
+    )
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"Ramping from {args.start} guilds (x{args.factor:g}, max {args.max}), "
+        f"{args.duration:g}s per step, stub latency {args.latency * 1000:.0f} ms, "
+        f"playback x{args.speed:g}\n"
+        f"SLOs: play p95 <= {args.slo_play_ms:g} ms, other commands p95 <= {args.slo_command_ms:g} ms, "
+        f"loop lag p99 <= {args.slo_lag_ms:g} ms, late frames <= {args.slo_late_frames:.1%}\n",
+        flush=True
+    )
+    print_header()
+
+    sustained = 0
+    guild_count = args.start
+    while guild_count <= args.max:
+        step = await run_step(args, guild_count)
+        broken = check_slos(args, step)
+        print_step(step, broken)
+        if broken:
+            break
+        sustained = guild_count
+        guild_count = max(guild_count + 1, int(guild_count * args.factor))
+
+    if sustained:
+        print(f"\nHighest step within SLOs: {sustained} guilds")
+    else:
+        print("\nThe first step already broke the SLOs")
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+End-to-end playback benchmark of MusicCog, fully offline.
+
+Every simulated guild runs the same session against the harness in
+benchmarks.harness: three +play searches from different members, +queue,
++saveplaylist, +skip, +loadplaylist, then waits until AutoDJ kept the music
+going for a number of tracks and disconnects. Guilds run concurrently.
+
+Reported:
+    command latency percentiles per command
+    time to first audio (first +play until the first frame is played)
+    inter-track gap (last frame of one track until first frame of the next)
+    late frames (read more than one frame interval past their deadline)
+    process CPU time and RSS growth, total and per guild
+
+Run from the repository root:
+    python -m benchmarks.playback_bench
+    python -m benchmarks.playback_bench --guilds 50 --latency 0.2 --speed 10
+"""
+
+import time
+import asyncio
+import argparse
+from typing import Dict, List
+from benchmarks.harness import OfflineHarness, FakeGuild, percentiles, rss_bytes
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--guilds", type=int, default=10, help="concurrent simulated guilds")
+    parser.add_argument("--tracks", type=int, default=6, help="tracks each guild must hear before leaving")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub extraction latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="latency jitter as a share of --latency")
+    parser.add_argument("--speed", type=float, default=10.0, help="playback speed-up (1 = real time)")
+    parser.add_argument("--fixture-seconds", type=float, default=3.0, help="length of every track")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="delay of every message send")
+    parser.add_argument("--timeout", type=float, default=120.0, help="give up on a guild after this many seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="show bot logs and command failures")
+    return parser.parse_args()
+
+async def run_session(harness: OfflineHarness, guild: FakeGuild, tracks: int) -> None:
+    """One guild's session; the clock for time to first audio starts at the first +play."""
+    members = [guild.member(i) for i in range(3)]
+    ctx = guild.context(members[0])
+
+    guild.first_request = time.perf_counter()
+    for i, member in enumerate(members):
+        await harness.invoke(guild.context(member), "play_music", url=f"guild {guild.id} song {i}")
+    await harness.invoke(ctx, "show_queue")
+    await harness.invoke(ctx, "save_playlist", "bench")
+    await harness.invoke(ctx, "skip_track")
+    await harness.invoke(ctx, "load_playlist", "bench")
+
+    await guild.wait_for_plays(tracks)
+    await harness.invoke(ctx, "show_queue")
+    await harness.invoke(ctx, "disconnect_bot")
+
+def format_ms(stats: Dict[str, float]) -> str:
+    return "  ".join(f"{name}={value * 1000:8.1f}" for name, value in stats.items()) or "-"
+
+def report(harness: OfflineHarness, wall: float, cpu: float, rss_growth: int, timed_out: int) -> None:
+    guilds = harness.guilds
+    print(
+        f"\n{len(guilds)} guilds, stub latency {harness.latency * 1000:.0f} ms "
+        f"(+-{harness.jitter:.0%}), playback x{harness.speed:g}, wall {wall:.2f}s"
+        + (f", {timed_out} guild(s) timed out" if timed_out else "")
+    )
+
+    print("\nCommand latency (ms)")
+    for command, values in sorted(harness.latencies.items()):
+        errors = harness.errors.get(command, 0)
+        print(f"  {command:<16} n={len(values):<5} {format_ms(percentiles(values))}"
+              + (f"  errors={errors}" if errors else ""))
+
+    ttfa = [value for value in (guild.time_to_first_audio() for guild in guilds) if value is not None]
+    gaps: List[float] = [gap for guild in guilds for gap in guild.gaps()]
+    plays = sum(len(guild.plays) for guild in guilds)
+    late = sum(guild.late_frames() for guild in guilds)
+    frames = sum(play.frames for guild in guilds for play in guild.plays)
+
+    print("\nPlayback (ms)")
+    print(f"  {'first audio':<16} n={len(ttfa):<5} {format_ms(percentiles(ttfa))}")
+    print(f"  {'inter-track gap':<16} n={len(gaps):<5} {format_ms(percentiles(gaps))}")
+    print(f"  tracks played {plays}, frames {frames}, late frames {late}"
+          + (f" ({late / frames:.2%})" if frames else ""))
+
+    print("\nProcess")
+    print(f"  CPU {cpu:.2f}s total, {cpu / len(guilds) * 1000:.1f} ms per guild")
+    print(f"  RSS {rss_bytes() / 2 ** 20:.1f} MiB, +{rss_growth / 2 ** 20:.1f} MiB during run, "
+          f"{rss_growth / len(guilds) / 1024:.0f} KiB per guild")
+    print(f"  stub calls {dict(sorted(harness.downloader.calls.items()))}")
+
+async def main(args: argparse.Namespace) -> None:
+    harness = OfflineHarness(
+        fixture_seconds=args.fixture_seconds,
+        latency=args.latency,
+        jitter=args.jitter,
+        speed=args.speed,
+        api_latency=args.api_latency,
+        seed=args.seed,
+        verbose=args.verbose
+    )
+    async with harness:
+        guilds = [harness.add_guild() for _ in range(args.guilds)]
+
+        rss_before = rss_bytes()
+        cpu_before = time.process_time()
+        started = time.perf_counter()
+
+        results = await asyncio.gather(*(
+            asyncio.wait_for(run_session(harness, guild, args.tracks), args.timeout)
+            for guild in guilds
+        ), return_exceptions=True)
+
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu_before
+        rss_growth = rss_bytes() - rss_before
+        timed_out = sum(isinstance(result, asyncio.TimeoutError) for result in results)
+
+    report(harness, wall, cpu, rss_growth, timed_out)
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
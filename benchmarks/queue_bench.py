@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of guild queue operations: plain list vs TrackQueue.
+
+Every operation runs against a queue that already holds `size` tracks, so
+the numbers show how the cost of one operation grows with queue length.
+
+Head/tail operations and the per-user index are O(1). Positional removal
+and move stay O(n) in TrackQueue too: deque indexing walks from the nearer
+end and the first positional access after removing a user's tracks
+compacts the deque. Shuffle is O(n) for both.
+
+Run from the repository root:
+    python -m benchmarks.queue_bench
+"""
+
+import time
+import random
+from typing import Any, Callable, List
+from music.track import Track
+from music.track_queue import TrackQueue
+
+SIZES = [1_000, 10_000, 100_000]
+USERS = 100
+OPERATIONS = 1_000
+# Shuffles touch the whole queue, fewer of them keep the run short
+SHUFFLES = 10
+
+def make_tracks(count: int) -> List[Track]:
+    """Build count dummy tracks spread over USERS users."""
+    return [
+        Track(
+            url=f"https://www.youtube.com/watch?v={i:011d}",
+            title=f"Track {i}",
+            uploader="Uploader",
+            duration=180,
+            id=f"{i:011d}",
+            user=f"user{i % USERS}",
+            user_id=i % USERS
+        )
+        for i in range(count)
+    ]
+
+def measure(
+    build: Callable[[], Any],
+    operation: Callable[[Any], None],
+    operations: int = OPERATIONS,
+    repeat: int = 5
+) -> float:
+    """Best wall time of operation on a freshly built queue, in microseconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        queue = build()
+        started = time.perf_counter()
+        operation(queue)
+        best = min(best, time.perf_counter() - started)
+    return best / operations * 1_000_000
+
+def pop_head_list(queue: List[Track]) -> None:
+    for _ in range(OPERATIONS):
+        queue.pop(0)
+
+def pop_head_deque(queue: TrackQueue) -> None:
+    for _ in range(OPERATIONS):
+        queue.popleft()
+
+def loop_list(queue: List[Track]) -> None:
+    for _ in range(OPERATIONS):
+        queue.insert(0, queue.pop(0))
+
+def loop_deque(queue: TrackQueue) -> None:
+    for _ in range(OPERATIONS):
+        queue.appendleft(queue.popleft())
+
+def count_user_list(queue: List[Track]) -> None:
+    for _ in range(OPERATIONS):
+        sum(1 for track in queue if track.user_id == 0)
+
+def count_user_deque(queue: TrackQueue) -> None:
+    for _ in range(OPERATIONS):
+        queue.count_user(0)
+
+def remove_user_list(queue: List[Track]) -> None:
+    for user in range(min(OPERATIONS, USERS)):
+        queue[:] = [track for track in queue if track.user_id != user]
+
+def remove_user_deque(queue: TrackQueue) -> None:
+    for user in range(min(OPERATIONS, USERS)):
+        queue.remove_user(user)
+
+def pop_middle_list(queue: List[Track]) -> None:
+    for _ in range(OPERATIONS):
+        queue.pop(len(queue) // 2)
+
+def pop_middle_deque(queue: TrackQueue) -> None:
+    for _ in range(OPERATIONS):
+        queue.pop(len(queue) // 2)
+
+def move_list(queue: List[Track]) -> None:
+    for _ in range(OPERATIONS):
+        queue.insert(0, queue.pop(len(queue) // 2))
+
+def move_deque(queue: TrackQueue) -> None:
+    for _ in range(OPERATIONS):
+        queue.move(len(queue) // 2, 0)
+
+def shuffle_list(queue: List[Track]) -> None:
+    for _ in range(SHUFFLES):
+        random.shuffle(queue)
+
+def shuffle_deque(queue: TrackQueue) -> None:
+    for _ in range(SHUFFLES):
+        queue.shuffle()
+
+# name, list implementation, TrackQueue implementation, operations per run
+BENCHMARKS = [
+    ("pop head", pop_head_list, pop_head_deque, OPERATIONS),
+    ("loop mode (re-insert at head)", loop_list, loop_deque, OPERATIONS),
+    ("count user's tracks", count_user_list, count_user_deque, OPERATIONS),
+    ("remove all tracks of a user", remove_user_list, remove_user_deque, OPERATIONS),
+    ("remove at middle position", pop_middle_list, pop_middle_deque, OPERATIONS),
+    ("move middle track to head", move_list, move_deque, OPERATIONS),
+    ("shuffle", shuffle_list, shuffle_deque, SHUFFLES),
+]
+
+def main() -> None:
+    print(f"{'operation':<32}{'size':>9}{'list us/op':>13}{'TrackQueue us/op':>19}{'speedup':>10}")
+    for size in SIZES:
+        tracks = make_tracks(size)
+        for name, list_impl, deque_impl, operations in BENCHMARKS:
+            list_us = measure(lambda: list(tracks), list_impl, operations)
+            deque_us = measure(lambda: TrackQueue(tracks), deque_impl, operations)
+            print(f"{name:<32}{size:>9}{list_us:>13.2f}{deque_us:>19.2f}{list_us / deque_us:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark of Track: the previous plain dataclass vs the slotted,
+interned Track, for tracks loaded the way playlists are (json.loads gives
+every track fresh string objects, even for repeated names).
+
+Run from the repository root:
+    python -m benchmarks.track_memory_bench
+"""
+
+import json
+import time
+import tracemalloc
+import datetime as dt
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from music.track import Track
+
+SIZES = [10_000, 50_000]
+UPLOADERS = 500
+USERS = 50
+
+@dataclass
+class LegacyTrack:
+    """Track as it was before: per-instance __dict__, no interning."""
+
+    url: str
+    title: str
+    uploader: str
+    duration: int
+    id: str
+    user: str
+    user_id: Optional[int] = None
+    stream_url: Optional[str] = field(default=None, repr=False, compare=False)
+    stream_expires: float = field(default=0.0, repr=False, compare=False)
+    codec: Optional[str] = field(default=None, repr=False, compare=False)
+
+    def get_duration_string(self) -> str:
+        return str(dt.timedelta(seconds=self.duration))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LegacyTrack":
+        return cls(**data)
+
+def make_payload(count: int) -> str:
+    """Serialized playlist with repeating uploader and requester names."""
+    return json.dumps([
+        {
+            "url": f"https://www.youtube.com/watch?v={i:011d}",
+            "title": f"Some song title number {i}",
+            "uploader": f"Uploader channel {i % UPLOADERS}",
+            "duration": 120 + i % 300,
+            "id": f"{i:011d}",
+            "user": f"Requester {i % USERS}",
+            "user_id": 100_000 + i % USERS,
+        }
+        for i in range(count)
+    ])
+
+def measure_memory(payload: str, factory: Callable[[Dict[str, Any]], Any]) -> float:
+    """Memory retained by tracks built from payload, in bytes per track."""
+    data = json.loads(payload)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracks = [factory(json.loads(json.dumps(item))) for item in data]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained / len(tracks)
+
+def measure_render(tracks: List[Any], rounds: int = 20) -> float:
+    """Time to render duration strings for all tracks, in microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for track in tracks:
+            track.get_duration_string()
+    return (time.perf_counter() - started) / (rounds * len(tracks)) * 1_000_000
+
+def main() -> None:
+    print(f"{'tracks':>8}{'legacy B/track':>17}{'slotted B/track':>18}{'saved':>8}"
+          f"{'legacy us/render':>19}{'cached us/render':>19}")
+    for size in SIZES:
+        payload = make_payload(size)
+        legacy_bytes = measure_memory(payload, LegacyTrack.from_dict)
+        slotted_bytes = measure_memory(payload, Track.from_dict)
+
+        items = json.loads(payload)
+        legacy_render = measure_render([LegacyTrack.from_dict(item) for item in items])
+        cached_render = measure_render([Track.from_dict(item) for item in items])
+
+        saved = (1 - slotted_bytes / legacy_bytes) * 100
+        print(f"{size:>8}{legacy_bytes:>17.0f}{slotted_bytes:>18.0f}{saved:>7.0f}%"
+              f"{legacy_render:>19.2f}{cached_render:>19.2f}")
+
+if __name__ == "__main__":
+    main()
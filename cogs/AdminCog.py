@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 
+import io
+import math
+import time
 import discord as dc
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from discord.ext import commands
 from config import BotConfig
 from utils.user_manager import UserManager
 from utils.logger import Logger
+from utils.metrics import REGISTRY, Counter, Gauge, Histogram, MetricsServer
+from utils.loop_watchdog import LoopWatchdog
+from utils.profiler import CpuProfiler, MemoryTracer, Report
+
+COMMAND_SECONDS = REGISTRY.histogram("musicbot_command_seconds", "Time spent handling a command", ("command",))
+COMMANDS_TOTAL = REGISTRY.counter("musicbot_commands_total", "Handled commands", ("command", "status"))
 
 
 class AdminCog(commands.Cog):
@@ -14,6 +23,12 @@ class AdminCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         super().__init__()
         self.bot = bot
+        self.metrics_server = MetricsServer()
+        self.loop_watchdog = LoopWatchdog()
+        self.cpu_profiler = CpuProfiler()
+        self.memory_tracer = MemoryTracer()
+        # message ID -> start time of the command it invoked
+        self.command_started: Dict[int, float] = {}
         self.man_page: List[Tuple[str, str, bool]] = [
             [
                 "+h/help/man",
@@ -80,6 +95,11 @@ class AdminCog(commands.Cog):
                 "Zapisuje aktualną kolejkę jako playlistę",
                 False,
             ],
+            [
+                "+ap/appendplaylist <nazwa>",
+                "Dopisuje aktualną kolejkę do playlisty",
+                False,
+            ],
             [
                 "+loadp/loadplaylist <nazwa>",
                 "Wczytuje zapisaną playlistę",
@@ -105,8 +125,43 @@ class AdminCog(commands.Cog):
                 "Usuwa ostatnie <ilość> wiadomości",
                 False,
             ],
+            [
+                "+st/stats",
+                "Wyświetla statystyki wydajności bota (administrator)",
+                False,
+            ],
+            [
+                "+mt/metrics",
+                "Podsumowuje metryki: opóźnienia komend, ekstrakcji, cache (administrator)",
+                False,
+            ],
+            [
+                "+prof/+mem <sekundy>/stop",
+                "Profiluje CPU / śledzi alokacje pamięci i wysyła raport (właściciel)",
+                False,
+            ],
         ]
 
+    async def cog_load(self) -> None:
+        """Start event loop watchdog and metrics endpoint."""
+        if BotConfig.LOOP_WATCHDOG_ENABLED:
+            self.loop_watchdog.start()
+        
+        if not BotConfig.METRICS_ENABLED:
+            return
+        try:
+            await self.metrics_server.start(BotConfig.METRICS_HOST, BotConfig.METRICS_PORT)
+        except OSError as e:
+            Logger.log_error(e, "METRICS_SERVER")
+
+    async def cog_unload(self) -> None:
+        """Stop metrics endpoint, watchdog and running profiling sessions."""
+        self.loop_watchdog.stop()
+        for session in (self.cpu_profiler, self.memory_tracer):
+            if session.running:
+                session.stop()
+        await self.metrics_server.stop()
+
     async def get_user_id(self, ctx: commands.Context) -> Tuple[str, int]:
         """Get user info - delegated to UserManager."""
         return await UserManager.get_user_info(ctx)
@@ -129,6 +184,34 @@ class AdminCog(commands.Cog):
             Logger.log_info(f"Auto-disconnecting from {voice_state.channel.name} (no users)", "VOICE")
             await voice_state.disconnect()
 
+    @commands.Cog.listener()
+    async def on_command(self, ctx: commands.Context) -> None:
+        """Start timing command."""
+        self.command_started[ctx.message.id] = time.perf_counter()
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context) -> None:
+        """Record successful command."""
+        self._record_command(ctx, "ok")
+
+    @commands.Cog.listener()
+    async def on_command_error(self, ctx: commands.Context, error: Exception) -> None:
+        """Record failed command; failed checks (permissions, owner only) get their own status."""
+        if isinstance(error, commands.CheckFailure):
+            self._record_command(ctx, "check_failed")
+        else:
+            self._record_command(ctx, "error")
+
+    def _record_command(self, ctx: commands.Context, status: str) -> None:
+        """Observe command latency; unknown commands were never started."""
+        started = self.command_started.pop(ctx.message.id, None)
+        if started is None or ctx.command is None:
+            return
+        
+        name = ctx.command.qualified_name
+        COMMAND_SECONDS.observe(time.perf_counter() - started, command=name)
+        COMMANDS_TOTAL.inc(command=name, status=status)
+
     @commands.command(aliases=["h", "help", "man"], pass_context=False)
     async def help_command(self, ctx: commands.Context) -> None:
         """Display help information."""
@@ -174,3 +257,205 @@ class AdminCog(commands.Cog):
         except Exception as e:
             Logger.log_error(e, "CLEAR_MESSAGES_UNEXPECTED")
             await ctx.send(f"❌ Nieoczekiwany błąd: {e}")
+
+    @commands.command(aliases=["st", "stats"])
+    @commands.has_permissions(administrator=True)
+    async def show_stats(self, ctx: commands.Context) -> None:
+        """Display runtime statistics (administrators only)."""
+        await self.get_user_id(ctx)
+        
+        music_cog = self.bot.get_cog("MusicCog")
+        if music_cog is None:
+            await ctx.send("❌ Moduł muzyczny nie jest załadowany.")
+            return
+        
+        embed = dc.Embed(
+            title="📊 Statystyki bota",
+            color=BotConfig.COLORS["info"],
+            timestamp=dc.utils.utcnow()
+        )
+        
+        sections = dict(music_cog.get_stats())
+        if BotConfig.LOOP_WATCHDOG_ENABLED:
+            sections["Blokady pętli zdarzeń"] = self.loop_watchdog.get_stats()
+        
+        for section, values in sections.items():
+            lines = [f"**{key}**: {value}" for key, value in values.items()]
+            embed.add_field(
+                name=section,
+                value="\n".join(lines)[:BotConfig.MAX_FIELD_VALUE_LENGTH] or "-",
+                inline=False
+            )
+        
+        await ctx.send(embed=embed)
+
+    @commands.command(aliases=["mt", "metrics"])
+    @commands.has_permissions(administrator=True)
+    async def show_metrics(self, ctx: commands.Context) -> None:
+        """Summarise collected metrics (administrators only)."""
+        await self.get_user_id(ctx)
+        REGISTRY.collect()
+        
+        embed = dc.Embed(
+            title="📈 Metryki",
+            color=BotConfig.COLORS["info"],
+            timestamp=dc.utils.utcnow()
+        )
+        if BotConfig.METRICS_ENABLED and self.metrics_server.runner is not None:
+            embed.description = f"Prometheus: `http://{BotConfig.METRICS_HOST}:{BotConfig.METRICS_PORT}/metrics`"
+        
+        errors = {
+            key[0]: value for key, value in COMMANDS_TOTAL.series().items() if key[1] == "error"
+        }
+        sections = [
+            ("Komendy (p50 / p95)", self._histogram_lines(COMMAND_SECONDS, errors)),
+            ("Etapy ekstrakcji (p50 / p95)", self._histogram_lines(
+                REGISTRY.metrics.get("musicbot_extraction_stage_seconds")
+            )),
+            ("Pobieranie", self._download_lines()),
+            ("Cache", self._cache_lines()),
+            ("Stan", self._state_lines()),
+        ]
+        for name, lines in sections:
+            embed.add_field(
+                name=name,
+                value="\n".join(lines)[:BotConfig.MAX_FIELD_VALUE_LENGTH] or "-",
+                inline=False
+            )
+        
+        await ctx.send(embed=embed)
+
+    @commands.command(aliases=["prof", "profile"])
+    @commands.is_owner()
+    async def profile_cpu(self, ctx: commands.Context, argument: Optional[str] = None) -> None:
+        """Start a bounded cProfile session, or stop it early with `stop` (owner only)."""
+        await self._run_session(ctx, self.cpu_profiler, argument, "Profilowanie CPU")
+
+    @commands.command(aliases=["mem", "memory"])
+    @commands.is_owner()
+    async def trace_memory(self, ctx: commands.Context, argument: Optional[str] = None) -> None:
+        """Trace allocations for a bounded time, or snapshot early with `stop` (owner only)."""
+        await self._run_session(ctx, self.memory_tracer, argument, "Śledzenie pamięci")
+
+    async def _run_session(
+        self,
+        ctx: commands.Context,
+        session: Union[CpuProfiler, MemoryTracer],
+        argument: Optional[str],
+        label: str
+    ) -> None:
+        """Start session for the requested seconds or stop it and upload the report."""
+        if argument == "stop":
+            if not session.running:
+                await ctx.send(f"❌ {label} nie jest uruchomione.")
+                return
+            await self._upload_report(ctx, session.stop(), label)
+            return
+        
+        if session.running:
+            await ctx.send(f"⏳ {label} już trwa, zostało {session.remaining():.0f}s. `stop` kończy wcześniej.")
+            return
+        
+        try:
+            seconds = float(argument) if argument is not None else BotConfig.PROFILER_DEFAULT_SECONDS
+            if math.isnan(seconds):
+                raise ValueError(argument)
+        except ValueError:
+            await ctx.send("❌ Podaj czas w sekundach albo `stop`.")
+            return
+        seconds = min(max(seconds, 1.0), BotConfig.PROFILER_MAX_SECONDS)
+        
+        try:
+            session.start(seconds, lambda: self._finish_session(ctx, session, label))
+        except ValueError as e:
+            # cProfile refuses to start while another profiler is active
+            await ctx.send(f"❌ Nie można uruchomić: {e}")
+            return
+        
+        Logger.log_info(f"{label} started for {seconds:.0f}s", f"PROFILER_BY_{ctx.author.display_name}")
+        await ctx.send(f"🔬 {label} przez {seconds:.0f}s, raport zostanie wysłany tutaj.")
+
+    async def _finish_session(self, ctx: commands.Context, session: Union[CpuProfiler, MemoryTracer], label: str) -> None:
+        """Timer callback: the session ran its full time."""
+        await self._upload_report(ctx, session.stop(), label)
+
+    async def _upload_report(self, ctx: commands.Context, report: Report, label: str) -> None:
+        """Send report files to the channel the session was started from."""
+        if not report:
+            await ctx.send(f"❌ {label}: brak danych do raportu.")
+            return
+        
+        files = [dc.File(io.BytesIO(data), filename=name) for name, data in report.items()]
+        try:
+            await ctx.send(f"📄 {label}: raport", files=files)
+        except dc.HTTPException as e:
+            Logger.log_error(e, "PROFILER_UPLOAD")
+            await ctx.send(f"❌ Nie udało się wysłać raportu ({label}).")
+
+    @staticmethod
+    def _histogram_lines(
+        metric: Optional[Histogram],
+        errors: Optional[Dict[str, float]] = None,
+        limit: int = 10
+    ) -> List[str]:
+        """Most frequent series of a single-label histogram with estimated p50/p95."""
+        if metric is None:
+            return []
+        
+        series = sorted(metric.series().items(), key=lambda item: sum(item[1][0]), reverse=True)
+        lines = []
+        for key, (counts, _) in series[:limit]:
+            p50 = metric.quantile(0.5, counts) or 0.0
+            p95 = metric.quantile(0.95, counts) or 0.0
+            line = f"**{key[0]}**: {sum(counts)}× {p50 * 1000:.0f} / {p95 * 1000:.0f} ms"
+            if errors and errors.get(key[0]):
+                line += f", błędy: {errors[key[0]]:.0f}"
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def _download_lines() -> List[str]:
+        """Downloaded volume and typical download speed."""
+        total = REGISTRY.metrics.get("musicbot_download_bytes_total")
+        speed = REGISTRY.metrics.get("musicbot_download_speed_bytes_per_second")
+        lines = []
+        if isinstance(total, Counter):
+            lines.append(f"**Pobrano**: {total.get() / 1024 ** 2:.1f} MiB")
+        if isinstance(speed, Histogram):
+            for counts, _ in speed.series().values():
+                median = speed.quantile(0.5, counts)
+                if median is not None:
+                    lines.append(f"**Prędkość (mediana)**: {median / 1024 ** 2:.2f} MiB/s z {sum(counts)} pobrań")
+        return lines
+
+    @staticmethod
+    def _cache_lines() -> List[str]:
+        """Hit rate of every cache."""
+        lookups = REGISTRY.metrics.get("musicbot_cache_lookups_total")
+        if not isinstance(lookups, Counter):
+            return []
+        
+        totals: Dict[str, Dict[str, float]] = {}
+        for (cache, result), value in lookups.series().items():
+            totals.setdefault(cache, {})[result] = value
+        lines = []
+        for cache, results in sorted(totals.items()):
+            hits, misses = results.get("hit", 0), results.get("miss", 0)
+            rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+            lines.append(f"**{cache}**: {rate:.1f}% trafień ({hits:.0f} / {hits + misses:.0f})")
+        return lines
+
+    @staticmethod
+    def _state_lines() -> List[str]:
+        """Current value of every gauge plus audio underruns."""
+        lines = []
+        for name, metric in sorted(REGISTRY.metrics.items()):
+            if isinstance(metric, Gauge):
+                for key, value in metric.series().items():
+                    label = name.removeprefix("musicbot_") + (f" ({', '.join(key)})" if key else "")
+                    lines.append(f"**{label}**: {value:g}")
+        
+        underruns = REGISTRY.metrics.get("musicbot_audio_underruns_total")
+        if isinstance(underruns, Counter):
+            lines.append(f"**audio_underruns**: {underruns.get():.0f}")
+        return lines
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 
 import discord as dc
+import asyncio
 import datetime as dt
 import os
 import lyricsgenius
-from typing import Optional, List
+from typing import Any, Coroutine, Optional, List
 from discord.ext import commands, tasks
 
 from config import BotConfig
@@ -12,30 +13,79 @@ from utils.rate_limiter import RateLimiter
 from utils.user_manager import UserManager
 from utils.file_manager import FileManager
 from utils.logger import Logger
+from utils.metrics import REGISTRY
 from music.track import Track
 from music.queue_manager import QueueManager
 from music.youtube_downloader import YouTubeDownloader
+from music.async_downloader import AsyncYouTubeDownloader
+from music.download_scheduler import Priority
+from music.prefetcher import TrackPrefetcher
+from music.batch_resolver import BatchResolver
+from music.audio_source import AudioSourceFactory
 from music.playlist_manager import PlaylistManager
 
+QUEUED_TRACKS = REGISTRY.gauge("musicbot_queued_tracks", "Tracks waiting in all guild queues")
+VOICE_CONNECTIONS = REGISTRY.gauge("musicbot_voice_connections", "Connected voice clients")
+PLAYING_GUILDS = REGISTRY.gauge("musicbot_playing_guilds", "Guilds currently playing audio")
+EXTRACTION_JOBS = REGISTRY.gauge("musicbot_extraction_jobs", "yt-dlp jobs in the worker pool", ("state",))
+SCHEDULER_WAITING = REGISTRY.gauge(
+    "musicbot_scheduler_waiting", "Jobs waiting for an extraction slot", ("priority",)
+)
+AUDIO_CACHE_BYTES = REGISTRY.gauge("musicbot_audio_cache_bytes", "Size of the on-disk audio cache")
+
 class MusicCog(commands.Cog):
     """Refactored Music Cog with improved structure and separation of concerns."""
     
-    def __init__(self, bot: commands.Bot) -> None:
+    def __init__(self, bot: commands.Bot, downloader: Optional[YouTubeDownloader] = None) -> None:
+        """
+        Args:
+            bot: Bot instance
+            downloader: Extraction backend, a fresh YouTubeDownloader by default
+                (benchmarks pass an offline stub)
+        """
         self.bot = bot
         
         # Initialize managers and utilities
-        self.rate_limiter = RateLimiter()
-        self.queue_manager = QueueManager()
-        self.youtube_downloader = YouTubeDownloader()
+        self.rate_limiter = RateLimiter(
+            lambda user_id, guild_id: self.queue_manager.count_user_tracks(guild_id, user_id)
+        )
+        self.youtube_downloader = downloader or YouTubeDownloader()
+        self.audio_cache = self.youtube_downloader.audio_cache
+        # Queued and playing tracks stay pinned in the audio cache
+        self.queue_manager = QueueManager(
+            on_acquire=self.audio_cache.pin,
+            on_release=self.audio_cache.release
+        )
+        
+        # All yt-dlp work goes through the worker pool, never the event loop
+        self.extractor = AsyncYouTubeDownloader(self.youtube_downloader)
+        self.prefetcher = TrackPrefetcher(self.extractor)
+        self.batch_resolver = BatchResolver(self.extractor)
+        self.audio_sources = AudioSourceFactory()
+        self.playlist_manager = PlaylistManager()
+        
+        # Fire-and-forget work such as cache warming downloads
+        self.background_tasks: set[asyncio.Task] = set()
         
         # Voice clients per guild
         self.voice_clients: dict[int, Optional[dc.VoiceClient]] = {}
         
-        # Music loop tasks per guild
-        self.music_loops: dict[int, Optional[tasks.Loop]] = {}
+        # Event-driven players per guild: the after= callback of
+        # voice_client.play sets track_finished, the player task advances
+        self.player_tasks: dict[int, asyncio.Task] = {}
+        self.player_contexts: dict[int, commands.Context] = {}
+        self.player_locks: dict[int, asyncio.Lock] = {}
+        self.track_finished: dict[int, asyncio.Event] = {}
+        self.pending_skips: dict[int, int] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Playback volume per guild (1.0 keeps Opus passthrough possible)
+        self.volumes: dict[int, float] = {}
         
         # AutoDJ settings per guild
         self.auto_dj_enabled: dict[int, bool] = {}
+        # Playlist additions still queueing tracks per guild; AutoDJ waits for them
+        self.batch_additions: dict[int, int] = {}
         
         # Initialize Genius API for lyrics
         self.genius = self._initialize_genius()
@@ -43,6 +93,9 @@ class MusicCog(commands.Cog):
         # Start cache cleanup task
         self.cache_cleanup_task.start()
         
+        # Refresh state gauges whenever metrics are exported
+        REGISTRY.add_collector(self._collect_metrics)
+        
         # Ensure directories exist
         FileManager.ensure_directories_exist()
     
@@ -64,6 +117,58 @@ class MusicCog(commands.Cog):
             Logger.log_error(e, "GENIUS_INIT")
         return None
     
+    async def cog_unload(self) -> None:
+        """Stop background tasks and release the extraction pool."""
+        self.cache_cleanup_task.cancel()
+        REGISTRY.remove_collector(self._collect_metrics)
+        for guild_id in list(self.prefetcher.tasks):
+            self.prefetcher.cancel_guild(guild_id)
+        for guild_id in list(self.player_tasks):
+            self._stop_player(guild_id)
+        for task in self.background_tasks:
+            task.cancel()
+        self.extractor.shutdown()
+        await asyncio.to_thread(self.audio_cache.save)
+        await asyncio.to_thread(self.youtube_downloader.search_cache.save)
+        self.playlist_manager.close()
+    
+    def get_stats(self) -> dict[str, dict[str, object]]:
+        """Collect runtime statistics for the admin stats command."""
+        return {
+            "Ekstrakcja (yt-dlp)": self.extractor.get_stats(),
+            "Kolejka pobierania": self.extractor.scheduler.get_stats(),
+            "Scalanie żądań": self.extractor.single_flight.get_stats(),
+            "Pula yt-dlp": self.youtube_downloader.ydl_pool.get_stats(),
+            "Etapy pobierania (średnio)": self.youtube_downloader.get_stage_stats(),
+            "Prefetch": self.prefetcher.get_stats(),
+            "Rozwiązywanie wsadowe": self.batch_resolver.get_stats(),
+            "Cache wyszukiwania": self.youtube_downloader.search_cache.get_stats(),
+            "Cache audio": self.audio_cache.get_stats(),
+            "Niedostępne filmy": self.youtube_downloader.negative_cache.get_stats(),
+            "Bezpieczniki profili": self.youtube_downloader.circuit_breaker.get_stats(),
+            "Źródła audio": self.audio_sources.get_stats(),
+        }
+    
+    def _collect_metrics(self) -> None:
+        """Copy current queue, voice and pool state into gauges."""
+        QUEUED_TRACKS.set(sum(len(queue) for queue in self.queue_manager.queues.values()))
+        
+        connected = [vc for vc in self.voice_clients.values() if vc and vc.is_connected()]
+        VOICE_CONNECTIONS.set(len(connected))
+        PLAYING_GUILDS.set(sum(1 for vc in connected if vc.is_playing()))
+        
+        extraction = self.extractor.get_stats()
+        EXTRACTION_JOBS.set(extraction["queued"], state="queued")
+        EXTRACTION_JOBS.set(extraction["active"], state="active")
+        for priority, waiting in self.extractor.scheduler.queued.items():
+            SCHEDULER_WAITING.set(waiting, priority=priority.name.lower())
+        
+        AUDIO_CACHE_BYTES.set(self.audio_cache.total_bytes)
+    
+    def _refresh_prefetch(self, guild_id: int) -> None:
+        """Keep the head of guild's queue warm after queue changes."""
+        self.prefetcher.refresh(guild_id, self.queue_manager.get_queue(guild_id))
+    
     def _check_user_limits(self, ctx: commands.Context, command_type: str = "play") -> tuple[bool, str]:
         """Check user rate limits and return result."""
         return self.rate_limiter.check_user_limits(
@@ -135,7 +240,7 @@ class MusicCog(commands.Cog):
         queue = self.queue_manager.get_queue(guild_id)
         if queue:
             # Limit to first 10 tracks to prevent embed overflow
-            displayed_tracks = queue[:10]
+            displayed_tracks = queue.peek(10)
             queue_info = []
             
             for i, track in enumerate(displayed_tracks, start=1):
@@ -200,7 +305,10 @@ class MusicCog(commands.Cog):
             )
             processing_msg = await ctx.send(embed=processing_embed)
             
-            track_info = self.youtube_downloader.get_track_info(url_or_query)
+            # Streaming mode only needs metadata and the media URL
+            track_info = await self.extractor.get_track_info(
+                url_or_query, download=not BotConfig.STREAM_PLAYBACK, guild_id=guild_id
+            )
             if not track_info:
                 # Check if this might be a YouTube bot detection issue
                 if "youtube.com" in url_or_query or "youtu.be" in url_or_query:
@@ -224,20 +332,22 @@ class MusicCog(commands.Cog):
                 await processing_msg.edit(embed=error_embed)
                 return
             
-            track = Track.from_yt_info(track_info, username)
+            track = Track.from_yt_info(track_info, username, ctx.author.id)
+            track.set_stream(
+                YouTubeDownloader.get_stream_url(track_info),
+                YouTubeDownloader.get_audio_codec(track_info)
+            )
             
-            # Add to queue and user count
+            # Add to queue
             self.queue_manager.add_track(guild_id, track)
-            self.rate_limiter.add_tracks_to_user_count(ctx.author.id, guild_id, 1)
+            self._refresh_prefetch(guild_id)
             
             # Send confirmation
             embed = self._create_track_embed("Dodano", track)
             await processing_msg.edit(embed=embed)
             
             # Start playing if nothing is playing
-            voice_client = await self._get_voice_client(ctx)
-            if voice_client and not voice_client.is_playing():
-                await self._play_next_track(ctx)
+            await self._start_playback(ctx)
                 
         except ValueError as e:
             error_embed = dc.Embed(
@@ -264,111 +374,243 @@ class MusicCog(commands.Cog):
             Logger.log_error(e, f"TRACK_ADDITION: {url_or_query}")
     
     async def _handle_playlist_addition(self, ctx: commands.Context, playlist_url: str, username: str, guild_id: int) -> None:
-        """Handle adding playlist to queue."""
-        playlist_info = self.youtube_downloader.get_playlist_info(playlist_url)
-        if not playlist_info:
-            await ctx.send("❌ Nie udało się pobrać playlisty.")
+        """
+        Handle adding playlist to queue.
+        
+        Only as many entries as the user may still queue are enumerated and
+        resolved concurrently. The first admitted track starts playing right
+        away and the rest are queued in playlist order as they are resolved.
+        Until the batch is done, AutoDJ does not add tracks ahead of it and
+        an empty queue does not disconnect the bot.
+        """
+        _, limit = self.rate_limiter.can_add_tracks(ctx.author.id, guild_id, BotConfig.MAX_QUEUE_PER_USER)
+        if limit == 0:
+            await ctx.send(f"⚠️ Osiągnąłeś limit utworów w kolejce.")
             return
         
-        # Check user limits for playlist
-        track_count = len(playlist_info)
-        can_add_all, max_addable = self.rate_limiter.can_add_tracks(
-            ctx.author.id, guild_id, track_count
-        )
-        
-        if not can_add_all and max_addable == 0:
-            await ctx.send(f"⚠️ Osiągnąłeś limit utworów w kolejce.")
+        playlist = await self.extractor.get_playlist_entries(playlist_url, limit, guild_id=guild_id)
+        if not playlist or not playlist[0]:
+            await ctx.send("❌ Nie udało się pobrać playlisty.")
             return
         
-        # Add tracks (limited if necessary)
-        tracks_to_add = playlist_info[:max_addable] if not can_add_all else playlist_info
-        tracks = [Track.from_yt_info(info, username) for info in tracks_to_add]
+        entries, track_count = playlist
+        track_count = max(track_count or 0, len(entries))
         
-        self.queue_manager.add_tracks(guild_id, tracks)
-        self.rate_limiter.add_tracks_to_user_count(ctx.author.id, guild_id, len(tracks))
+        added = 0
+        self.batch_additions[guild_id] = self.batch_additions.get(guild_id, 0) + 1
+        try:
+            async for track in self.batch_resolver.resolve(
+                entries, username, guild_id, user_id=ctx.author.id
+            ):
+                if track is None:
+                    continue
+                
+                self.queue_manager.add_track(guild_id, track)
+                self._refresh_prefetch(guild_id)
+                added += 1
+                
+                # Start playing as soon as the first track is queued
+                if added == 1:
+                    await self._start_playback(ctx)
+        finally:
+            remaining = self.batch_additions.pop(guild_id) - 1
+            if remaining:
+                self.batch_additions[guild_id] = remaining
+        
+        if added == 0:
+            await ctx.send("❌ Nie udało się pobrać playlisty.")
+            return
         
         # Send confirmation
         embed = dc.Embed(title="Dodano playlistę", color=BotConfig.COLORS["success"])
         embed.add_field(name="Kto dodał", value=username, inline=True)
-        embed.add_field(name="Utworów dodano", value=str(len(tracks)), inline=True)
+        embed.add_field(name="Utworów dodano", value=str(added), inline=True)
         
-        if not can_add_all:
+        if added < track_count:
             embed.add_field(
                 name="Uwaga", 
-                value=f"Dodano tylko {len(tracks)} z {track_count} utworów (limit użytkownika)", 
+                value=f"Dodano tylko {added} z {track_count} utworów (limit użytkownika)", 
                 inline=False
             )
         
         await ctx.send(embed=embed)
         
-        # Start playing if nothing is playing
-        voice_client = await self._get_voice_client(ctx)
-        if voice_client and not voice_client.is_playing():
-            await self._play_next_track(ctx)
+        # The first track may have failed to play before the rest arrived
+        await self._start_playback(ctx)
     
     async def _play_next_track(self, ctx: commands.Context, position: int = 0) -> None:
         """Play next track from queue."""
         guild_id = ctx.guild.id
+        started = False
         
-        # Get current track for cleanup
-        old_track = self.queue_manager.get_current_track(guild_id)
-        
-        # Get next track
-        next_track = self.queue_manager.get_next_track(guild_id, position)
-        
-        if next_track:
-            # Update current track
-            self.queue_manager.set_current_track(guild_id, next_track)
-            
-            # Update user count
-            user_id = UserManager.get_user_id_from_name(next_track.user, guild_id, self.bot)
-            if user_id:
-                self.rate_limiter.remove_tracks_from_user_count(user_id, guild_id, 1)
+        async with self._get_player_lock(guild_id):
+            voice_client = self.voice_clients.get(guild_id)
+            if not voice_client or not voice_client.is_connected():
+                return
+            if voice_client.is_playing() or voice_client.is_paused():
+                # Another command already started playback
+                return
             
-            # Play the track
-            voice_client = self.voice_clients[guild_id]
-            if voice_client:
-                audio_source = dc.FFmpegPCMAudio(
-                    FileManager.get_file_path(next_track.id),
-                    **BotConfig.FFMPEG_OPTS
+            # Unplayable tracks are skipped until one starts or the queue runs dry
+            next_track = self.queue_manager.get_next_track(guild_id, position)
+            while next_track:
+                # Update current track
+                self.queue_manager.set_current_track(guild_id, next_track)
+                
+                # Play the track
+                audio_source = await self._create_audio_source(guild_id, next_track)
+                if audio_source is None:
+                    await ctx.send(f"❌ Nie udało się odtworzyć: **{next_track.title}**, pomijam.")
+                    next_track = self.queue_manager.get_next_track(guild_id)
+                    continue
+                
+                if not voice_client.is_connected():
+                    # Disconnected while the source was being resolved
+                    return
+                
+                voice_client.play(
+                    audio_source,
+                    after=lambda error, guild_id=guild_id: self._on_track_end(guild_id, error)
                 )
-                voice_client.play(audio_source)
+                self._refresh_prefetch(guild_id)
+                started = True
                 
                 # Send now playing message
                 embed = self._create_track_embed("Teraz odtwarzane", next_track)
                 await ctx.send(embed=embed)
-                
-                # Start music loop
-                await self._start_music_loop(ctx)
-                
-                # Clean up old file
-                if old_track:
-                    FileManager.cleanup_files(old_track.id)
-                
-                # Check for AutoDJ
-                await self._check_auto_dj(ctx)
-        else:
-            # No more tracks, disconnect
-            self.queue_manager.set_current_track(guild_id, None)
-            if guild_id in self.voice_clients and self.voice_clients[guild_id]:
-                await self.voice_clients[guild_id].disconnect()
+                break
             
-            # Clean up all files
-            active_ids = self.queue_manager.get_all_active_track_ids()
-            FileManager.cleanup_files(active_ids=active_ids)
+            if not started:
+                self.queue_manager.set_current_track(guild_id, None)
+                if self.batch_additions.get(guild_id):
+                    # A playlist is still being queued, it restarts playback when done
+                    return
+                # No more tracks, disconnect
+                self.prefetcher.cancel_guild(guild_id)
+                await voice_client.disconnect()
+        
+        if started:
+            # Check for AutoDJ
+            await self._check_auto_dj(ctx)
+    
+    async def _start_playback(self, ctx: commands.Context) -> None:
+        """Start playing the queue unless the guild is already playing."""
+        voice_client = await self._get_voice_client(ctx)
+        if voice_client:
+            self._ensure_player(ctx)
+            await self._play_next_track(ctx)
+    
+    def _get_player_lock(self, guild_id: int) -> asyncio.Lock:
+        """Get lock serializing track changes in guild."""
+        if guild_id not in self.player_locks:
+            self.player_locks[guild_id] = asyncio.Lock()
+        return self.player_locks[guild_id]
     
-    async def _start_music_loop(self, ctx: commands.Context) -> None:
-        """Start or restart music loop for guild."""
+    def _ensure_player(self, ctx: commands.Context) -> None:
+        """Start guild's player task if it is not running."""
         guild_id = ctx.guild.id
+        self.player_contexts[guild_id] = ctx
+        self.loop = asyncio.get_running_loop()
         
-        if guild_id in self.music_loops and self.music_loops[guild_id]:
-            if self.music_loops[guild_id].is_running():
-                self.music_loops[guild_id].restart(ctx)
-            else:
-                self.music_loops[guild_id].start(ctx)
-        else:
-            self.music_loops[guild_id] = self.music_loop
-            self.music_loops[guild_id].start(ctx)
+        task = self.player_tasks.get(guild_id)
+        if task is None or task.done():
+            self.track_finished[guild_id] = asyncio.Event()
+            self.player_tasks[guild_id] = asyncio.create_task(self._player_loop(guild_id))
+    
+    def _stop_player(self, guild_id: int) -> None:
+        """Stop guild's player task."""
+        task = self.player_tasks.pop(guild_id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+        self.track_finished.pop(guild_id, None)
+        self.pending_skips.pop(guild_id, None)
+    
+    def _on_track_end(self, guild_id: int, error: Optional[Exception]) -> None:
+        """Voice thread callback: hand track completion back to the event loop."""
+        if error:
+            Logger.log_error(error, f"PLAYBACK: {guild_id}")
+        
+        event = self.track_finished.get(guild_id)
+        if event is not None and self.loop is not None:
+            self.loop.call_soon_threadsafe(event.set)
+    
+    async def _player_loop(self, guild_id: int) -> None:
+        """Advance guild's queue each time the current track ends."""
+        event = self.track_finished[guild_id]
+        
+        while True:
+            await event.wait()
+            event.clear()
+            
+            ctx = self.player_contexts[guild_id]
+            position = self.pending_skips.pop(guild_id, None)
+            
+            try:
+                # Explicit skips bypass looping
+                if position is None and self.queue_manager.is_looping(guild_id):
+                    current = self.queue_manager.get_current_track(guild_id)
+                    if current:
+                        self.queue_manager.add_track_front(guild_id, current)
+                
+                await self._play_next_track(ctx, position or 0)
+            except Exception as e:
+                Logger.log_error(e, f"PLAYER_LOOP: {guild_id}")
+            
+            voice_client = self.voice_clients.get(guild_id)
+            if not voice_client or not voice_client.is_connected():
+                self._stop_player(guild_id)
+                return
+    
+    async def _create_audio_source(self, guild_id: int, track: Track) -> Optional[dc.AudioSource]:
+        """
+        Build FFmpeg audio source for track (Opus passthrough when possible).
+        
+        Prefers an already downloaded file, then direct streaming from the
+        resolved media URL, and downloads the whole file only as a fallback.
+        """
+        # Reuse in-flight prefetch instead of resolving the track twice
+        await self.prefetcher.wait_for(guild_id, track)
+        
+        volume = self.volumes.get(guild_id, 1.0)
+        
+        file_path = self.audio_cache.lookup(track.id)
+        if file_path:
+            return await self.audio_sources.create(
+                file_path, BotConfig.FFMPEG_OPTS, self.audio_cache.get_codec(track.id), volume
+            )
+        
+        if BotConfig.STREAM_PLAYBACK:
+            if not track.has_fresh_stream():
+                track.set_stream(*await self.extractor.resolve_stream(
+                    track.url, guild_id=guild_id, priority=Priority.NOW_PLAYING
+                ))
+            if track.stream_url:
+                # Only tracks that keep coming back are worth a second extraction
+                if BotConfig.AUDIO_CACHE_WARM_ON_STREAM and self.audio_cache.note_stream(track.id):
+                    self._run_in_background(self.extractor.extract_info(
+                        track.url, download=True, guild_id=guild_id, priority=Priority.WARMING
+                    ))
+                return await self.audio_sources.create(
+                    track.stream_url, BotConfig.FFMPEG_STREAM_OPTS, track.codec, volume
+                )
+            Logger.log_warning(f"Stream URL unavailable, downloading instead: {track.url}", "PLAYBACK")
+        
+        info = await self.extractor.extract_info(
+            track.url, download=True, guild_id=guild_id, priority=Priority.NOW_PLAYING
+        )
+        file_path = FileManager.find_file(track.id) if info else None
+        if file_path:
+            return await self.audio_sources.create(
+                file_path, BotConfig.FFMPEG_OPTS, self.audio_cache.get_codec(track.id), volume
+            )
+        
+        return None
+    
+    def _run_in_background(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """Run fire-and-forget coroutine, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
     
     async def _check_auto_dj(self, ctx: commands.Context) -> None:
         """Check if AutoDJ should add similar tracks."""
@@ -377,18 +619,30 @@ class MusicCog(commands.Cog):
         if not self.auto_dj_enabled.get(guild_id, True):
             return
         
+        # Tracks of a playlist being queued must not end up behind AutoDJ picks
+        if self.batch_additions.get(guild_id):
+            return
+        
         if self.queue_manager.get_queue_length(guild_id) < 2:
             current = self.queue_manager.get_current_track(guild_id)
             if current:
-                similar_tracks = self.youtube_downloader.get_similar_tracks(
-                    current.to_dict(), count=3
+                similar_tracks = await self.extractor.get_similar_tracks(
+                    current.to_dict(), count=3, guild_id=guild_id
                 )
                 
                 if similar_tracks:
                     await ctx.send("🎵 Dodaję podobne utwory do kolejki...")
                     
-                    tracks = [Track.from_yt_info(info, "AutoDJ 🤖") for info in similar_tracks]
+                    tracks = [
+                        track async for track in self.batch_resolver.resolve(
+                            similar_tracks, "AutoDJ 🤖", guild_id, Priority.AUTO_DJ
+                        )
+                        if track is not None
+                    ]
+                    if not tracks:
+                        return
                     self.queue_manager.add_tracks(guild_id, tracks)
+                    self._refresh_prefetch(guild_id)
                     
                     embed = dc.Embed(
                         title="Dodano podobne utwory",
@@ -397,29 +651,16 @@ class MusicCog(commands.Cog):
                     )
                     await ctx.send(embed=embed)
     
-    @tasks.loop(seconds=5.0)
-    async def music_loop(self, ctx: commands.Context) -> None:
-        """Music loop to handle track progression."""
-        guild_id = ctx.guild.id
-        voice_client = self.voice_clients.get(guild_id)
-        
-        if voice_client and not voice_client.is_playing() and not voice_client.is_paused():
-            # Handle looping
-            if self.queue_manager.is_looping(guild_id):
-                current = self.queue_manager.get_current_track(guild_id)
-                if current:
-                    # Add current track back to beginning of queue
-                    queue = self.queue_manager.get_queue(guild_id)
-                    queue.insert(0, current)
-            
-            await self._play_next_track(ctx)
-    
     @tasks.loop(hours=1)
     async def cache_cleanup_task(self) -> None:
         """Clean up expired cache entries."""
         removed_count = self.youtube_downloader.clear_expired_cache()
         if removed_count > 0:
             Logger.log_cache_cleanup(removed_count)
+        
+        # Persist caches so they survive restarts
+        await asyncio.to_thread(self.audio_cache.save)
+        await asyncio.to_thread(self.youtube_downloader.search_cache.save)
     
     # Command implementations (Traditional prefix commands)
     @commands.command(pass_context=True, aliases=["p", "play"])
@@ -499,6 +740,8 @@ class MusicCog(commands.Cog):
             return
         
         if voice_client.is_playing():
+            # Player task advances once the track ends, skipping bypasses loop mode
+            self.pending_skips[guild_id] = 0
             voice_client.stop()
             embed = dc.Embed(
                 title="⏭️ Pominięto",
@@ -525,7 +768,7 @@ class MusicCog(commands.Cog):
             await ctx.send(f"⚠️ {error_msg}")
             return
         
-        results = self.youtube_downloader.search_youtube(query, 5)
+        results = await self.extractor.search_youtube(query, 5, guild_id=guild_id)
         if not results:
             await ctx.send("❌ Nie znaleziono wyników.")
             return
@@ -537,7 +780,7 @@ class MusicCog(commands.Cog):
         embed.add_field(name="Kto szukał", value=username, inline=True)
         
         for track_info in results:
-            duration_str = str(dt.timedelta(seconds=track_info.get('duration', 0)))
+            duration_str = str(dt.timedelta(seconds=track_info.get('duration') or 0))
             embed.add_field(
                 name=f"{track_info['title']}: {duration_str}",
                 value=f"{BotConfig.YOUTUBE_BASE_URL}{track_info['id']}",
@@ -592,10 +835,14 @@ class MusicCog(commands.Cog):
             await ctx.send("Kolejka jest pusta lub pozycja jest nieprawidłowa.")
             return
         
-        if voice_client.is_playing():
+        if voice_client.is_playing() or voice_client.is_paused():
+            # Player task advances to the chosen position once the track ends
+            self._ensure_player(ctx)
+            self.pending_skips[guild_id] = position - 1
             voice_client.stop()
-        
-        await self._play_next_track(ctx, position - 1)
+        else:
+            self._ensure_player(ctx)
+            await self._play_next_track(ctx, position - 1)
     
     @commands.command(pass_context=False, aliases=["q", "queue"])
     async def show_queue(self, ctx: commands.Context) -> None:
@@ -630,17 +877,14 @@ class MusicCog(commands.Cog):
         
         # Check permissions
         track_to_delete = queue[position - 1]
-        if not UserManager.user_can_modify_track(ctx, track_to_delete.user):
+        if not UserManager.user_can_modify_track(ctx, track_to_delete.user, track_to_delete.user_id):
             await ctx.send("⚠️ Możesz usuwać tylko swoje utwory z kolejki!")
             return
         
         # Remove track
         removed_track = self.queue_manager.remove_track(guild_id, position - 1)
         if removed_track:
-            # Update user count
-            user_id = UserManager.get_user_id_from_name(removed_track.user, guild_id, self.bot)
-            if user_id:
-                self.rate_limiter.remove_tracks_from_user_count(user_id, guild_id, 1)
+            self._refresh_prefetch(guild_id)
             
             embed = self._create_track_embed("Usunięto z kolejki", removed_track)
             await ctx.send(embed=embed)
@@ -662,7 +906,7 @@ class MusicCog(commands.Cog):
         
         self.queue_manager.clear_queue(guild_id)
         self.queue_manager.set_current_track(guild_id, None)
-        self.rate_limiter.clear_user_queue_count(guild_id)
+        self.prefetcher.cancel_guild(guild_id)
         
         await ctx.send("Zatrzymano odtwarzanie i wyczyszczono kolejkę.")
     
@@ -682,7 +926,8 @@ class MusicCog(commands.Cog):
             await voice_client.disconnect()
             self.queue_manager.clear_queue(guild_id)
             self.queue_manager.set_current_track(guild_id, None)
-            self.rate_limiter.clear_user_queue_count(guild_id)
+            self.prefetcher.cancel_guild(guild_id)
+            self._stop_player(guild_id)
             await ctx.send("Rozłączono z kanału głosowego.")
         else:
             await ctx.send("Bot nie jest połączony z żadnym kanałem głosowym.")
@@ -704,7 +949,7 @@ class MusicCog(commands.Cog):
             return
         
         if volume is None:
-            current_volume = getattr(voice_client, "volume", 1.0) * 100
+            current_volume = self.volumes.get(guild_id, 1.0) * 100
             await ctx.send(f"Aktualna głośność: {int(current_volume)}%")
             return
         
@@ -712,8 +957,14 @@ class MusicCog(commands.Cog):
             await ctx.send("Głośność musi być między 0 a 200%")
             return
         
-        voice_client.volume = volume / 100
-        await ctx.send(f"Głośność ustawiona na {volume}%")
+        self.volumes[guild_id] = volume / 100
+        
+        # PCM sources can change volume live, Opus passthrough cannot
+        if isinstance(voice_client.source, dc.PCMVolumeTransformer):
+            voice_client.source.volume = volume / 100
+            await ctx.send(f"Głośność ustawiona na {volume}%")
+        else:
+            await ctx.send(f"Głośność ustawiona na {volume}% (od następnego utworu)")
     
     @commands.command(pass_context=True, aliases=["l", "lyrics"])
     async def show_lyrics(self, ctx: commands.Context) -> None:
@@ -793,12 +1044,34 @@ class MusicCog(commands.Cog):
             await ctx.send("❌ Kolejka jest pusta, nie ma czego zapisać.")
             return
         
-        success = PlaylistManager.save_playlist(name, queue, username)
+        success = await self.playlist_manager.save_playlist_async(name, queue, username, guild_id)
         if success:
             await ctx.send(f"✅ Playlista '{name}' została zapisana z {len(queue)} utworami.")
         else:
             await ctx.send(f"❌ Błąd podczas zapisywania playlisty '{name}'.")
     
+    @commands.command(pass_context=True, aliases=["ap", "appendplaylist"])
+    async def append_playlist(self, ctx: commands.Context, name: str) -> None:
+        """Append current queue to playlist, creating it if needed."""
+        username, guild_id = await UserManager.get_user_info(ctx)
+        
+        # Check rate limits
+        can_proceed, error_msg = self._check_user_limits(ctx, "appendplaylist")
+        if not can_proceed:
+            await ctx.send(f"⚠️ {error_msg}")
+            return
+        
+        queue = self.queue_manager.get_queue(guild_id)
+        if not queue:
+            await ctx.send("❌ Kolejka jest pusta, nie ma czego dopisać.")
+            return
+        
+        track_count = await self.playlist_manager.append_tracks_async(name, queue, username, guild_id)
+        if track_count is not None:
+            await ctx.send(f"✅ Dopisano {len(queue)} utworów do playlisty '{name}' (razem: {track_count}).")
+        else:
+            await ctx.send(f"❌ Błąd podczas dopisywania do playlisty '{name}'.")
+    
     @commands.command(pass_context=True, aliases=["loadp", "loadplaylist"])
     async def load_playlist(self, ctx: commands.Context, name: str) -> None:
         """Load saved playlist."""
@@ -810,29 +1083,30 @@ class MusicCog(commands.Cog):
             await ctx.send(f"⚠️ {error_msg}")
             return
         
-        playlist_data = PlaylistManager.load_playlist(name)
+        # Only load as many tracks as the user may still queue
+        _, limit = self.rate_limiter.can_add_tracks(ctx.author.id, guild_id, BotConfig.MAX_QUEUE_PER_USER)
+        if limit == 0:
+            await ctx.send(f"⚠️ Osiągnąłeś limit utworów w kolejce.")
+            return
+        
+        playlist_data = await self.playlist_manager.load_playlist_async(name, guild_id, limit)
         if not playlist_data:
             await ctx.send(f"❌ Playlista '{name}' nie istnieje.")
             return
         
-        tracks = playlist_data["utwory"]
-        if not tracks:
+        tracks_to_add = playlist_data["utwory"]
+        track_count = playlist_data["liczba_utworow"]
+        if not tracks_to_add:
             await ctx.send("❌ Playlista jest pusta.")
             return
         
-        # Check user limits
-        can_add_all, max_addable = self.rate_limiter.can_add_tracks(
-            ctx.author.id, guild_id, len(tracks)
-        )
-        
         # Update track ownership to current user
-        tracks_to_add = tracks[:max_addable] if not can_add_all else tracks
         for track in tracks_to_add:
-            track.user = username
+            track.set_owner(username, ctx.author.id)
         
         # Add tracks to queue
         self.queue_manager.add_tracks(guild_id, tracks_to_add)
-        self.rate_limiter.add_tracks_to_user_count(ctx.author.id, guild_id, len(tracks_to_add))
+        self._refresh_prefetch(guild_id)
         
         # Send confirmation
         embed = dc.Embed(
@@ -843,10 +1117,10 @@ class MusicCog(commands.Cog):
         embed.add_field(name="Utworzona przez", value=playlist_data["utworzony_przez"], inline=True)
         embed.add_field(name="Data utworzenia", value=playlist_data["utworzony_dnia"], inline=True)
         
-        if not can_add_all:
+        if len(tracks_to_add) < track_count:
             embed.add_field(
                 name="Uwaga",
-                value=f"Dodano tylko {len(tracks_to_add)} z {len(tracks)} utworów (limit użytkownika)",
+                value=f"Dodano tylko {len(tracks_to_add)} z {track_count} utworów (limit użytkownika)",
                 inline=False
             )
         
@@ -854,18 +1128,17 @@ class MusicCog(commands.Cog):
         
         # Start playing if needed
         if ctx.author.voice:
-            voice_client = await self._get_voice_client(ctx)
-            if voice_client and not voice_client.is_playing():
-                await self._play_next_track(ctx)
+            await self._start_playback(ctx)
         else:
             await ctx.send("Dołącz do kanału głosowego, aby rozpocząć odtwarzanie.")
     
     @commands.command(pass_context=False, aliases=["pl", "playlists"])
     async def list_playlists(self, ctx: commands.Context) -> None:
         """List all saved playlists."""
-        await UserManager.get_user_info(ctx)
+        _, guild_id = await UserManager.get_user_info(ctx)
         
-        playlists = PlaylistManager.get_playlist_list()
+        # Embeds hold at most 25 fields
+        playlists = await self.playlist_manager.get_playlist_list_async(guild_id, limit=25)
         if not playlists:
             await ctx.send("❌ Nie znaleziono żadnych zapisanych playlist.")
             return
@@ -879,6 +1152,10 @@ class MusicCog(commands.Cog):
                 inline=False
             )
         
+        total = await self.playlist_manager.count_playlists_async(guild_id)
+        if total > len(playlists):
+            embed.set_footer(text=f"Pokazano {len(playlists)} najnowszych z {total} playlist")
+        
         await ctx.send(embed=embed)
     
     @commands.command(aliases=["autodj", "similar"])
@@ -20,16 +20,55 @@ class BotConfig:
     
     # Cache Configuration
     SEARCH_CACHE_EXPIRY = 3600  # 1 hour in seconds
+    SEARCH_CACHE_MAX_ENTRIES = 2000  # LRU bound on cached queries
+    
+    # Extraction Worker Pool (yt-dlp runs off the event loop)
+    EXTRACTION_WORKERS = 4  # concurrent yt-dlp jobs across all guilds
+    EXTRACTION_TIMEOUT = 60  # seconds, metadata and search calls
+    DOWNLOAD_TIMEOUT = 300  # seconds, calls that download audio
+    YDL_POOL_SIZE = EXTRACTION_WORKERS  # YoutubeDL instances per extraction profile
+    YDL_POOL_PREWARM = ("primary",)  # profiles built at startup, others on first use
+    SCHEDULER_GUILD_WEIGHTS: Dict[int, float] = {}  # guild_id -> fair share weight, default 1
+    BATCH_RESOLVE_PARALLELISM = 4  # playlist/AutoDJ entries resolved at once
+    BATCH_RESOLVE_TIMEOUT = 30  # seconds per entry
+    
+    # Extraction failure handling
+    NEGATIVE_CACHE_TTL = 6 * 3600  # seconds a private/unavailable video is not retried
+    NEGATIVE_CACHE_MAX_ENTRIES = 5000
+    BREAKER_WINDOW = 20  # recent attempts tracked per extraction profile
+    BREAKER_MIN_ATTEMPTS = 4  # attempts needed before a circuit may open
+    BREAKER_THRESHOLD = 0.5  # bot-detection failure rate that opens the circuit
+    BREAKER_COOLDOWN = 300  # seconds a failing profile is skipped
     
     # Directory Paths
     FILES_DIR = "./files"
     PLAYLISTS_DIR = "./playlists"
     LOGS_DIR = "./logs"
     
+    # Playlist store; legacy *.json playlists are imported once on first start
+    PLAYLISTS_DB = f"{PLAYLISTS_DIR}/playlists.db"
+    
+    # Persistent audio cache - downloaded files stay in FILES_DIR between plays.
+    # With STREAM_PLAYBACK only the download fallback fills it, unless
+    # AUDIO_CACHE_WARM_ON_STREAM is enabled
+    AUDIO_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
+    AUDIO_CACHE_POLICY = "lru"  # "lru" or "lfu"
+    AUDIO_CACHE_INDEX = f"{FILES_DIR}/cache_index.json"
+    # Download a streamed track in background once it is streamed again; every
+    # warm-up is a second extraction plus a full download, so it is off by default
+    AUDIO_CACHE_WARM_ON_STREAM = False
+    AUDIO_CACHE_STREAM_HISTORY = 1000  # streamed video IDs remembered for repeat detection
+    
+    # Search cache snapshot, reloaded at startup
+    SEARCH_CACHE_FILE = f"{FILES_DIR}/search_cache.db"
+    
     # Audio Configuration - With YouTube authentication bypass and flexible format
     YDL_OPTS: Dict[str, Any] = {
         "format": "bestaudio[ext=webm]/bestaudio[ext=mp4]/bestaudio/best[height<=480]/best",
-        "outtmpl": f"{FILES_DIR}/%(id)s.%(ext)s",
+        "outtmpl": "%(id)s.%(ext)s",
+        # Download into a temp dir and move into FILES_DIR only when complete,
+        # so a half-written file is never visible under its final name
+        "paths": {"home": FILES_DIR, "temp": ".tmp"},
         "restrictfilenames": True,
         "noplaylist": True,
         "nocheckcertificate": True,
@@ -65,6 +104,39 @@ class BotConfig:
         "options": "-vn",
     }
     
+    # Opus passthrough - let FFmpeg emit Opus (stream copy for Opus sources)
+    # instead of decoding to PCM that discord.py re-encodes per frame;
+    # PCM is still used whenever volume differs from 100%
+    OPUS_PASSTHROUGH = True
+    
+    # Streaming playback - feed the resolved media URL straight to FFmpeg
+    # instead of downloading the whole file first (download stays as fallback)
+    STREAM_PLAYBACK = True
+    STREAM_URL_TTL = 3 * 3600  # seconds; YouTube media URLs expire after ~6h
+    FFMPEG_STREAM_OPTS: Dict[str, str] = {
+        "before_options": "-nostdin -reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
+        "options": "-vn",
+    }
+    
+    # Prefetching - number of upcoming tracks per guild kept ready to play
+    PREFETCH_DEPTH = 2
+    
+    # Metrics - Prometheus text format at http://METRICS_HOST:METRICS_PORT/metrics
+    METRICS_ENABLED = True
+    METRICS_HOST = "127.0.0.1"  # local only, put a scraper or proxy in front
+    METRICS_PORT = 9108
+    
+    # Event loop watchdog - logs and aggregates call sites that block the loop
+    LOOP_WATCHDOG_ENABLED = True
+    LOOP_WATCHDOG_INTERVAL = 0.1  # seconds between heartbeats
+    LOOP_BLOCK_THRESHOLD = 0.25  # seconds of heartbeat delay reported as a stall
+    
+    # On-demand profiling (+prof, +mem) - owner only, nothing runs between sessions
+    PROFILER_DEFAULT_SECONDS = 30
+    PROFILER_MAX_SECONDS = 600
+    PROFILER_REPORT_LINES = 40  # entries per section of the uploaded report
+    PROFILER_TRACE_FRAMES = 10  # stack depth recorded by tracemalloc
+    
     # URLs
     YOUTUBE_BASE_URL = "https://www.youtube.com/watch?v="
     
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from config import BotConfig
+from utils.logger import Logger
+from music.youtube_downloader import YouTubeDownloader
+from music.single_flight import SingleFlight
+from music.download_scheduler import DownloadScheduler, Priority
+
+class AsyncYouTubeDownloader:
+    """Async facade running blocking YouTubeDownloader calls on a bounded worker pool."""
+
+    def __init__(
+        self,
+        downloader: YouTubeDownloader,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        download_timeout: Optional[float] = None
+    ):
+        self.downloader = downloader
+        self.max_workers = max_workers or BotConfig.EXTRACTION_WORKERS
+        self.timeout = timeout or BotConfig.EXTRACTION_TIMEOUT
+        self.download_timeout = download_timeout or BotConfig.DOWNLOAD_TIMEOUT
+        # Concurrent requests for the same video/query share one extraction
+        self.single_flight = SingleFlight()
+        # Decides which waiting job gets the next worker
+        self.scheduler = DownloadScheduler(self.max_workers)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="yt-extract"
+        )
+
+        # Queue depth bookkeeping (touched from worker threads)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.stats: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+        }
+
+    def is_youtube_link(self, text: str) -> bool:
+        """Check if text is a YouTube URL."""
+        return self.downloader.is_youtube_link(text)
+
+    def is_youtube_playlist_link(self, text: str) -> bool:
+        """Check if text is a YouTube playlist URL."""
+        return self.downloader.is_youtube_playlist_link(text)
+
+    async def extract_info(
+        self,
+        url: str,
+        download: bool = True,
+        *,
+        guild_id: Optional[int] = None,
+        priority: Priority = Priority.USER_ADD
+    ) -> Optional[Dict[str, Any]]:
+        """Extract information from URL off the event loop."""
+        timeout = self.download_timeout if download else self.timeout
+        return await self.single_flight.run(
+            self._coalesce_key("extract", url, download),
+            lambda: self._run(
+                f"extract_info: {url}", timeout, guild_id, priority,
+                self.downloader.extract_info, url, download
+            )
+        )
+
+    async def search_youtube(
+        self,
+        query: str,
+        max_results: int = 1,
+        *,
+        guild_id: Optional[int] = None,
+        priority: Priority = Priority.USER_ADD
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Search YouTube off the event loop."""
+        return await self.single_flight.run(
+            f"search:{self.downloader.normalize_query(query)}:{max_results}",
+            lambda: self._run(
+                f"search: {query}", self.timeout, guild_id, priority,
+                self.downloader.search_youtube, query, max_results
+            )
+        )
+
+    async def get_track_info(
+        self,
+        url_or_query: str,
+        download: bool = True,
+        *,
+        guild_id: Optional[int] = None,
+        priority: Priority = Priority.USER_ADD
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve (and optionally download) a single track off the event loop."""
+        timeout = self.download_timeout if download else self.timeout
+        return await self.single_flight.run(
+            self._coalesce_key("track", url_or_query, download),
+            lambda: self._run(
+                f"get_track_info: {url_or_query}", timeout, guild_id, priority,
+                self.downloader.get_track_info, url_or_query, download
+            )
+        )
+
+    async def resolve_stream(
+        self,
+        url: str,
+        *,
+        guild_id: Optional[int] = None,
+        priority: Priority = Priority.NOW_PLAYING
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve fresh media URL and codec for streaming off the event loop."""
+        result = await self.single_flight.run(
+            f"stream:{self._key(url)}",
+            lambda: self._run(
+                f"stream: {url}", self.timeout, guild_id, priority,
+                self.downloader.resolve_stream, url
+            )
+        )
+        return result or (None, None)
+
+    async def get_playlist_entries(
+        self,
+        url: str,
+        limit: int,
+        *,
+        guild_id: Optional[int] = None,
+        priority: Priority = Priority.USER_ADD
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """Enumerate first playlist entries off the event loop."""
+        return await self._run(
+            f"playlist: {url}", self.timeout, guild_id, priority,
+            self.downloader.get_playlist_entries, url, limit
+        )
+
+    async def get_similar_tracks(
+        self,
+        track_info: Dict[str, Any],
+        count: int = 3,
+        *,
+        guild_id: Optional[int] = None,
+        priority: Priority = Priority.AUTO_DJ
+    ) -> List[Dict[str, Any]]:
+        """Find similar tracks off the event loop."""
+        result = await self._run(
+            f"similar: {track_info.get('title', 'unknown')}", self.timeout, guild_id, priority,
+            self.downloader.get_similar_tracks, track_info, count
+        )
+        return result or []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker pool metrics."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                **self.stats,
+            }
+
+    def _key(self, url_or_query: str) -> str:
+        """Get coalescing key: video ID for links, normalized text otherwise."""
+        return self.downloader.get_video_id(url_or_query) or self.downloader.normalize_query(url_or_query)
+
+    def _coalesce_key(self, kind: str, url_or_query: str, download: bool) -> str:
+        """
+        Get coalescing key of an extraction.
+
+        Downloads of a known video share one key whichever method asked for
+        them, both return the info dict of that video. Queries only resolve
+        to a video inside the worker, where YouTubeDownloader serializes
+        downloads of the same video.
+        """
+        video_id = self.downloader.get_video_id(url_or_query)
+        if download and video_id:
+            return f"download:{video_id}"
+        return f"{kind}:{self._key(url_or_query)}:{download}"
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop queued jobs."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.downloader.ydl_pool.close()
+
+    async def _run(
+        self,
+        label: str,
+        timeout: float,
+        guild_id: Optional[int],
+        priority: Priority,
+        func: Callable[..., Any],
+        *args: Any
+    ) -> Any:
+        """
+        Run blocking function on the worker pool with a timeout.
+
+        The job first waits for a scheduler slot (priority class, then fair
+        share of its guild); the timeout covers that wait too. Jobs that did
+        not start yet are cancelled on timeout. A job that already started
+        cannot be interrupted, its result is discarded and the slot frees up
+        once yt-dlp returns (bounded by socket_timeout).
+
+        Returns:
+            Function result or None on timeout
+        """
+        with self._lock:
+            self.stats["submitted"] += 1
+
+        try:
+            return await asyncio.wait_for(self._submit(guild_id, priority, func, *args), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.stats["timed_out"] += 1
+            Logger.log_warning(f"{label} timed out after {timeout}s", "EXTRACTION")
+            return None
+
+    async def _submit(self, guild_id: Optional[int], priority: Priority, func: Callable[..., Any], *args: Any) -> Any:
+        """Hand job to a worker once the scheduler grants it a slot."""
+        await self.scheduler.acquire(guild_id, priority)
+        loop = asyncio.get_running_loop()
+
+        try:
+            with self._lock:
+                self.queued += 1
+            future = self.executor.submit(self._invoke, func, *args)
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            self.scheduler.release()
+            raise
+
+        future.add_done_callback(self._on_done)
+        # Slot stays taken until the worker is really done, even after a timeout
+        future.add_done_callback(lambda _: self._release_slot(loop))
+
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Worker-side: return scheduler slot on the event loop."""
+        try:
+            loop.call_soon_threadsafe(self.scheduler.release)
+        except RuntimeError:
+            # Event loop already closed during shutdown
+            pass
+
+    def _invoke(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Worker-side wrapper keeping queue depth counters current."""
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def _on_done(self, future: Future) -> None:
+        """Account for finished or never-started jobs."""
+        with self._lock:
+            if future.cancelled():
+                # Cancelled before a worker picked it up
+                self.queued -= 1
+            elif future.exception() is not None:
+                self.stats["failed"] += 1
+            else:
+                self.stats["completed"] += 1
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import time
+import discord as dc
+from typing import Dict, Any, Optional
+from config import BotConfig
+from utils.logger import Logger
+from utils.metrics import REGISTRY
+
+FRAME_SECONDS = 0.02  # discord.py reads one 20 ms frame per packet
+
+UNDERRUNS = REGISTRY.counter(
+    "musicbot_audio_underruns_total", "Audio frames whose read took longer than one frame"
+)
+
+class _FrameMeter:
+    """Counts frames that were not ready in time (FFmpeg starved, stream stalled)."""
+
+    def read(self) -> bytes:
+        started = time.perf_counter()
+        data = super().read()
+        if time.perf_counter() - started > FRAME_SECONDS:
+            UNDERRUNS.inc()
+        return data
+
+class MeteredPCMVolumeTransformer(_FrameMeter, dc.PCMVolumeTransformer):
+    pass
+
+class MeteredFFmpegOpusAudio(_FrameMeter, dc.FFmpegOpusAudio):
+    pass
+
+class AudioSourceFactory:
+    """Builds playback sources, passing Opus through instead of re-encoding PCM when possible."""
+
+    def __init__(self):
+        self.stats: Dict[str, int] = {
+            "opus_copy": 0,
+            "opus_encode": 0,
+            "opus_probe": 0,
+            "pcm": 0,
+        }
+
+    async def create(
+        self,
+        source: str,
+        ffmpeg_opts: Dict[str, str],
+        codec: Optional[str] = None,
+        volume: float = 1.0
+    ) -> dc.AudioSource:
+        """
+        Create audio source for a file path or media URL.
+
+        PCM (decoded and re-encoded to Opus in Python for every 20 ms frame)
+        is only used when the volume has to be changed. Otherwise FFmpeg
+        emits Opus directly: a stream copy when the source already is Opus,
+        a native encode when it is not, and an ffprobe when the codec is
+        unknown.
+
+        Args:
+            source: File path or media URL
+            ffmpeg_opts: before_options/options for FFmpeg
+            codec: Source audio codec if known (e.g. "opus")
+            volume: Playback volume, 1.0 means unchanged
+        """
+        if not BotConfig.OPUS_PASSTHROUGH or volume != 1.0:
+            self.stats["pcm"] += 1
+            return MeteredPCMVolumeTransformer(dc.FFmpegPCMAudio(source, **ffmpeg_opts), volume=volume)
+
+        if codec is None:
+            self.stats["opus_probe"] += 1
+            try:
+                return await MeteredFFmpegOpusAudio.from_probe(source, **ffmpeg_opts)
+            except Exception as e:
+                Logger.log_error(e, f"AUDIO_PROBE: {source[:100]}")
+                codec = "unknown"
+
+        if codec.startswith("opus"):
+            self.stats["opus_copy"] += 1
+            return MeteredFFmpegOpusAudio(source, codec="copy", **ffmpeg_opts)
+
+        self.stats["opus_encode"] += 1
+        return MeteredFFmpegOpusAudio(source, **ffmpeg_opts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get source selection statistics."""
+        return dict(self.stats)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import asyncio
+from typing import Dict, Any, AsyncIterator, List, Optional
+from config import BotConfig
+from utils.logger import Logger
+from music.track import Track
+from music.youtube_downloader import YouTubeDownloader
+from music.async_downloader import AsyncYouTubeDownloader
+from music.download_scheduler import Priority
+
+class BatchResolver:
+    """Turns batches of flat entries (playlist pages, search hits) into Tracks concurrently."""
+
+    def __init__(
+        self,
+        extractor: AsyncYouTubeDownloader,
+        parallelism: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.extractor = extractor
+        self.parallelism = parallelism or BotConfig.BATCH_RESOLVE_PARALLELISM
+        self.timeout = timeout or BotConfig.BATCH_RESOLVE_TIMEOUT
+        self.stats: Dict[str, int] = {
+            "from_entry": 0,
+            "resolved": 0,
+            "failed": 0,
+            "timed_out": 0,
+        }
+
+    async def resolve(
+        self,
+        entries: List[Dict[str, Any]],
+        username: str,
+        guild_id: Optional[int] = None,
+        priority: Priority = Priority.USER_ADD,
+        user_id: Optional[int] = None
+    ) -> AsyncIterator[Optional[Track]]:
+        """
+        Yield a Track (or None if it could not be resolved) for every entry, in input order.
+
+        Entries with complete metadata become Tracks immediately; the rest are
+        resolved concurrently, at most `parallelism` at a time, each bounded by
+        `timeout`. A result is yielded as soon as it and everything before it
+        is done. Work still pending when the caller stops iterating is cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.parallelism)
+        tasks = [
+            asyncio.create_task(self._resolve_one(entry, username, user_id, guild_id, priority, semaphore))
+            for entry in entries
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get resolution statistics."""
+        return {"parallelism": self.parallelism, **self.stats}
+
+    async def _resolve_one(
+        self,
+        entry: Dict[str, Any],
+        username: str,
+        user_id: Optional[int],
+        guild_id: Optional[int],
+        priority: Priority,
+        semaphore: asyncio.Semaphore
+    ) -> Optional[Track]:
+        """Create Track from entry, resolving the video only when metadata is missing."""
+        try:
+            track = Track.from_yt_info(entry, username, user_id)
+            self.stats["from_entry"] += 1
+            return track
+        except ValueError:
+            pass
+
+        url = f"{BotConfig.YOUTUBE_BASE_URL}{entry['id']}"
+        async with semaphore:
+            try:
+                info = await asyncio.wait_for(
+                    self.extractor.get_track_info(url, download=False, guild_id=guild_id, priority=priority),
+                    self.timeout
+                )
+            except asyncio.TimeoutError:
+                self.stats["timed_out"] += 1
+                Logger.log_warning(f"Resolving {url} timed out after {self.timeout}s", "BATCH_RESOLVE")
+                return None
+
+        if not info:
+            self.stats["failed"] += 1
+            return None
+
+        try:
+            track = Track.from_yt_info(info, username, user_id)
+        except ValueError as e:
+            self.stats["failed"] += 1
+            Logger.log_error(e, f"TRACK_CREATION: {url}")
+            return None
+
+        track.set_stream(YouTubeDownloader.get_stream_url(info), YouTubeDownloader.get_audio_codec(info))
+        self.stats["resolved"] += 1
+        return track
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Deque, Optional
+from config import BotConfig
+from utils.logger import Logger
+
+class CircuitBreaker:
+    """
+    Tracks bot-detection failure rate per extraction profile and temporarily
+    skips profiles that keep failing.
+
+    A circuit opens when at least BREAKER_THRESHOLD of the last BREAKER_WINDOW
+    attempts failed. After BREAKER_COOLDOWN seconds a single trial attempt is
+    let through (half-open): success closes the circuit, failure reopens it,
+    and an inconclusive outcome (network or server error) keeps it open for
+    another cooldown.
+    """
+
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        threshold: Optional[float] = None,
+        cooldown: Optional[float] = None,
+        min_attempts: Optional[int] = None
+    ):
+        self.window = window or BotConfig.BREAKER_WINDOW
+        self.threshold = threshold or BotConfig.BREAKER_THRESHOLD
+        self.cooldown = cooldown or BotConfig.BREAKER_COOLDOWN
+        self.min_attempts = min_attempts or BotConfig.BREAKER_MIN_ATTEMPTS
+
+        self.outcomes: Dict[str, Deque[bool]] = {}
+        self.open_until: Dict[str, float] = {}
+        self.half_open: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """Check if an attempt with this profile may run now."""
+        with self._lock:
+            open_until = self.open_until.get(key)
+            if open_until is None:
+                return True
+            if time.time() < open_until or self.half_open.get(key):
+                return False
+            # Cooldown over - let one trial attempt through
+            self.half_open[key] = True
+            return True
+
+    def record_success(self, key: str) -> None:
+        """Record attempt that was not blocked by bot detection."""
+        with self._lock:
+            self._outcomes(key).append(False)
+            if key in self.open_until:
+                del self.open_until[key]
+                self.half_open.pop(key, None)
+                self.outcomes[key].clear()
+                Logger.log_info(f"Circuit closed for profile '{key}'", "CIRCUIT_BREAKER")
+
+    def record_neutral(self, key: str) -> None:
+        """
+        Record attempt that says nothing about the profile (network or server error).
+
+        Outside a trial nothing changes. A half-open trial ends without a
+        verdict, so the circuit stays open for another cooldown and the next
+        trial runs after it; without this the trial would never finish and
+        allow() would refuse the profile for good.
+        """
+        with self._lock:
+            if self.half_open.pop(key, False):
+                self.open_until[key] = time.time() + self.cooldown
+                Logger.log_info(
+                    f"Trial for profile '{key}' inconclusive, circuit stays open for {self.cooldown}s",
+                    "CIRCUIT_BREAKER"
+                )
+
+    def record_failure(self, key: str) -> None:
+        """Record bot-detection failure, opening the circuit when the rate is too high."""
+        with self._lock:
+            outcomes = self._outcomes(key)
+            outcomes.append(True)
+            failure_rate = sum(outcomes) / len(outcomes)
+
+            if self.half_open.pop(key, False) or (
+                len(outcomes) >= self.min_attempts and failure_rate >= self.threshold
+            ):
+                self.open_until[key] = time.time() + self.cooldown
+                Logger.log_warning(
+                    f"Circuit opened for profile '{key}' for {self.cooldown}s "
+                    f"(failure rate {failure_rate:.0%})",
+                    "CIRCUIT_BREAKER"
+                )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get state and recent failure rate of each profile."""
+        with self._lock:
+            stats = {}
+            for key, outcomes in self.outcomes.items():
+                remaining = self.open_until.get(key, 0) - time.time()
+                state = f"open ({remaining:.0f}s)" if remaining > 0 else (
+                    "half-open" if key in self.open_until else "closed"
+                )
+                rate = sum(outcomes) / len(outcomes) if outcomes else 0.0
+                stats[key] = f"{state}, failures {rate:.0%} of {len(outcomes)}"
+            return stats
+
+    def _outcomes(self, key: str) -> Deque[bool]:
+        """Get outcome window for profile (caller holds the lock)."""
+        if key not in self.outcomes:
+            self.outcomes[key] = deque(maxlen=self.window)
+        return self.outcomes[key]
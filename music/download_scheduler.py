@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import time
+import heapq
+import asyncio
+from collections import deque
+from enum import IntEnum
+from typing import Dict, Any, Deque, List, Optional, Tuple
+from config import BotConfig
+
+class Priority(IntEnum):
+    """Extraction priority classes, lower value is served first."""
+    NOW_PLAYING = 0
+    PREFETCH = 1
+    USER_ADD = 2
+    AUTO_DJ = 3
+    WARMING = 4
+
+class _Waiter:
+    """Job waiting for a slot."""
+
+    def __init__(self, future: asyncio.Future, priority: Priority, guild_id: Optional[int], enqueued: float):
+        self.future = future
+        self.priority = priority
+        self.guild_id = guild_id
+        self.enqueued = enqueued
+
+class DownloadScheduler:
+    """
+    Admits extraction jobs under a global concurrency cap.
+
+    Waiting jobs are served by priority class first. Within a class guilds
+    share the slots by weighted fair queuing: every job gets a virtual finish
+    tag of max(virtual clock, guild's previous tag) + 1 / weight, and the
+    smallest tag runs next. A guild that queues a long playlist therefore
+    only gets its fair share while other guilds have jobs waiting.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, weights: Optional[Dict[int, float]] = None):
+        self.capacity = capacity or BotConfig.EXTRACTION_WORKERS
+        self.weights = weights if weights is not None else BotConfig.SCHEDULER_GUILD_WEIGHTS
+        self.active = 0
+
+        # (priority, finish_tag, sequence, waiter)
+        self.heap: List[Tuple[int, float, int, _Waiter]] = []
+        self.virtual_time: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+        # Only kept for (priority, guild) pairs with jobs waiting, so the
+        # dicts do not grow with every guild the bot has ever served
+        self.last_tag: Dict[Tuple[Priority, Optional[int]], float] = {}
+        self.waiting: Dict[Tuple[Priority, Optional[int]], int] = {}
+        self.sequence = 0
+
+        self.queued: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.wait_times: Dict[Priority, Deque[float]] = {priority: deque(maxlen=200) for priority in Priority}
+
+    async def acquire(self, guild_id: Optional[int], priority: Priority) -> None:
+        """Wait for a slot; every acquire must be paired with release()."""
+        if self.active < self.capacity and not self.heap:
+            self.active += 1
+            self.wait_times[priority].append(0.0)
+            return
+
+        key = (priority, guild_id)
+        weight = self.weights.get(guild_id, 1.0) if guild_id is not None else 1.0
+        tag = max(self.virtual_time[priority], self.last_tag.get(key, 0.0)) + 1.0 / weight
+        self.last_tag[key] = tag
+        self.waiting[key] = self.waiting.get(key, 0) + 1
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), priority, guild_id, time.perf_counter())
+        heapq.heappush(self.heap, (priority, tag, self.sequence, waiter))
+        self.sequence += 1
+        self.queued[priority] += 1
+        # Heap may only hold cancelled waiters while slots are free
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted just as we got cancelled, pass it on
+                self.release()
+            else:
+                # Left in the heap, skipped at dispatch
+                self.queued[priority] -= 1
+                self._forget(waiter)
+            raise
+
+    def release(self) -> None:
+        """Return slot and admit the next waiting job."""
+        self.active -= 1
+        self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get slot usage and queue wait times per priority class."""
+        stats: Dict[str, Any] = {"slots": f"{self.active} / {self.capacity}"}
+        for priority in Priority:
+            waits = sorted(self.wait_times[priority])
+            if not waits and not self.queued[priority]:
+                continue
+            average = sum(waits) / len(waits) if waits else 0.0
+            p95 = waits[int(len(waits) * 0.95)] if waits else 0.0
+            stats[priority.name.lower()] = (
+                f"queued {self.queued[priority]}, wait avg {average:.2f}s, p95 {p95:.2f}s"
+            )
+        return stats
+
+    def _dispatch(self) -> None:
+        """Grant free slots to the first waiters in (priority, finish tag) order."""
+        while self.active < self.capacity and self.heap:
+            priority, tag, _, waiter = heapq.heappop(self.heap)
+            if waiter.future.done():
+                # Cancelled while waiting
+                continue
+
+            self.active += 1
+            self.queued[priority] -= 1
+            self.virtual_time[priority] = tag
+            self.wait_times[priority].append(time.perf_counter() - waiter.enqueued)
+            self._forget(waiter)
+            waiter.future.set_result(None)
+
+    def _forget(self, waiter: _Waiter) -> None:
+        """Drop guild's finish tag once it has no jobs waiting in the class; it restarts from the virtual clock."""
+        key = (waiter.priority, waiter.guild_id)
+        remaining = self.waiting.get(key, 0) - 1
+        if remaining > 0:
+            self.waiting[key] = remaining
+        else:
+            self.waiting.pop(key, None)
+            self.last_tag.pop(key, None)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from config import BotConfig
+
+class NegativeCache:
+    """Remembers videos and playlists known to be unavailable so they are not extracted again."""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl or BotConfig.NEGATIVE_CACHE_TTL
+        self.max_entries = max_entries or BotConfig.NEGATIVE_CACHE_MAX_ENTRIES
+        # video_id -> (expires_at, reason), oldest first
+        self.entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "added": 0}
+        self._lock = threading.Lock()
+
+    def get(self, video_id: Optional[str]) -> Optional[str]:
+        """
+        Check if video is known to be dead.
+
+        Returns:
+            Failure reason or None if video is not in the cache
+        """
+        if not video_id:
+            return None
+
+        with self._lock:
+            item = self.entries.get(video_id)
+            if item is None:
+                return None
+            if time.time() >= item[0]:
+                del self.entries[video_id]
+                return None
+            self.stats["hits"] += 1
+            return item[1]
+
+    def add(self, video_id: Optional[str], reason: str) -> None:
+        """Mark video as unavailable for the configured TTL."""
+        if not video_id:
+            return
+
+        with self._lock:
+            self.entries[video_id] = (time.time() + self.ttl, reason)
+            self.entries.move_to_end(video_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.stats["added"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {"entries": len(self.entries), **self.stats}
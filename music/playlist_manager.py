@@ -2,6 +2,9 @@
 
 import os
 import json
+import asyncio
+import sqlite3
+import threading
 import datetime as dt
 from typing import List, Dict, Any, Optional
 from music.track import Track
@@ -9,144 +12,382 @@ from config import BotConfig
 from utils.logger import Logger
 
 class PlaylistManager:
-    """Manages saving and loading of playlists."""
+    """
+    Stores playlists in an SQLite database.
     
-    @staticmethod
-    def save_playlist(name: str, tracks: List[Track], creator: str) -> bool:
+    Metadata lives in its own table so listing never touches track rows,
+    every write is a single transaction, and playlists are namespaced per
+    guild. Namespace 0 is global: it holds playlists imported from the old
+    one-JSON-file-per-playlist layout and is visible from every guild.
+    """
+    
+    GLOBAL_NAMESPACE = 0
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+        "CREATE TABLE IF NOT EXISTS playlists ("
+        "guild_id INTEGER NOT NULL, name TEXT NOT NULL, creator TEXT NOT NULL, "
+        "created TEXT NOT NULL, track_count INTEGER NOT NULL, "
+        "PRIMARY KEY (guild_id, name))",
+        "CREATE TABLE IF NOT EXISTS playlist_tracks ("
+        "guild_id INTEGER NOT NULL, name TEXT NOT NULL, position INTEGER NOT NULL, "
+        "data TEXT NOT NULL, PRIMARY KEY (guild_id, name, position))",
+    )
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or BotConfig.PLAYLISTS_DB
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        
+        # One shared connection, serialized by the lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+        
+        self.import_json_files()
+    
+    def save_playlist(self, name: str, tracks: List[Track], creator: str, guild_id: int) -> bool:
         """
-        Save playlist to file.
+        Save playlist, replacing existing one with the same name in guild.
         
         Args:
             name: Playlist name
             tracks: List of tracks to save
             creator: Username of creator
+            guild_id: Guild namespace
             
         Returns:
             True if successful, False otherwise
         """
+        created = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [
+            (guild_id, name, position, json.dumps(track.to_dict(), ensure_ascii=False))
+            for position, track in enumerate(tracks)
+        ]
+        
         try:
-            if not os.path.exists(BotConfig.PLAYLISTS_DIR):
-                os.makedirs(BotConfig.PLAYLISTS_DIR)
-            
-            playlist_data = {
-                "nazwa": name,
-                "utworzony_przez": creator,
-                "utworzony_dnia": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "utwory": [track.to_dict() for track in tracks]
-            }
-            
-            file_path = f"{BotConfig.PLAYLISTS_DIR}/{name}.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(playlist_data, f, ensure_ascii=False, indent=4)
+            with self._lock, self.conn:
+                self._write(guild_id, name, creator, created, rows)
             
-            Logger.log_info(f"Playlist '{name}' saved with {len(tracks)} tracks", "PLAYLIST")
+            Logger.log_info(f"Playlist '{name}' saved with {len(rows)} tracks (guild {guild_id})", "PLAYLIST")
             return True
             
-        except Exception as e:
+        except sqlite3.Error as e:
             Logger.log_error(e, f"SAVE_PLAYLIST: {name}")
             return False
     
-    @staticmethod
-    def load_playlist(name: str) -> Optional[Dict[str, Any]]:
+    def append_tracks(self, name: str, tracks: List[Track], creator: str, guild_id: int) -> Optional[int]:
         """
-        Load playlist from file.
+        Append tracks to visible playlist without rewriting existing ones.
+        
+        Creates the playlist in guild's namespace if it does not exist. A
+        global playlist is never modified: it is copied into the guild's
+        namespace first and the copy gets the new tracks.
         
         Args:
             name: Playlist name
+            tracks: Tracks to append
+            creator: Username of creator, used for a new playlist
+            guild_id: Guild namespace
             
         Returns:
-            Playlist data dict or None if failed/not found
+            New track count or None if failed
         """
         try:
-            file_path = f"{BotConfig.PLAYLISTS_DIR}/{name}.json"
+            with self._lock, self.conn:
+                meta = self._find(name, guild_id)
+                if meta is None:
+                    namespace, start = guild_id, 0
+                    self.conn.execute(
+                        "INSERT INTO playlists (guild_id, name, creator, created, track_count) "
+                        "VALUES (?, ?, ?, ?, 0)",
+                        (namespace, name, creator, dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                    )
+                else:
+                    namespace, _, _, start = meta
+                    if namespace != guild_id:
+                        self._copy_to_namespace(name, namespace, guild_id)
+                        namespace = guild_id
+                
+                self.conn.executemany(
+                    "INSERT INTO playlist_tracks (guild_id, name, position, data) VALUES (?, ?, ?, ?)",
+                    [
+                        (namespace, name, start + offset, json.dumps(track.to_dict(), ensure_ascii=False))
+                        for offset, track in enumerate(tracks)
+                    ]
+                )
+                self.conn.execute(
+                    "UPDATE playlists SET track_count = ? WHERE guild_id = ? AND name = ?",
+                    (start + len(tracks), namespace, name)
+                )
             
-            if not os.path.exists(file_path):
-                return None
+            Logger.log_info(f"Appended {len(tracks)} tracks to playlist '{name}'", "PLAYLIST")
+            return start + len(tracks)
             
-            with open(file_path, "r", encoding="utf-8") as f:
-                playlist_data = json.load(f)
+        except sqlite3.Error as e:
+            Logger.log_error(e, f"APPEND_PLAYLIST: {name}")
+            return None
+    
+    def load_playlist(self, name: str, guild_id: int, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load playlist, preferring guild's own over a global one.
+        
+        Args:
+            name: Playlist name
+            guild_id: Guild namespace
+            limit: Load only the first limit tracks
             
-            # Convert track dicts back to Track objects
-            tracks = [Track.from_dict(track_data) for track_data in playlist_data.get("utwory", [])]
-            playlist_data["utwory"] = tracks
+        Returns:
+            Playlist data dict or None if failed/not found; "liczba_utworow"
+            holds the full track count even when fewer tracks were loaded
+        """
+        try:
+            with self._lock:
+                meta = self._find(name, guild_id)
+                if meta is None:
+                    return None
+                
+                namespace, creator, created, track_count = meta
+                rows = self.conn.execute(
+                    "SELECT data FROM playlist_tracks WHERE guild_id = ? AND name = ? "
+                    "ORDER BY position LIMIT ?",
+                    (namespace, name, -1 if limit is None else limit)
+                ).fetchall()
             
-            Logger.log_info(f"Playlist '{name}' loaded with {len(tracks)} tracks", "PLAYLIST")
-            return playlist_data
+            tracks = [Track.from_dict(json.loads(data)) for (data,) in rows]
             
-        except Exception as e:
+            Logger.log_info(f"Playlist '{name}' loaded with {len(tracks)} of {track_count} tracks", "PLAYLIST")
+            return {
+                "nazwa": name,
+                "utworzony_przez": creator,
+                "utworzony_dnia": created,
+                "liczba_utworow": track_count,
+                "utwory": tracks
+            }
+            
+        except (sqlite3.Error, ValueError, KeyError) as e:
             Logger.log_error(e, f"LOAD_PLAYLIST: {name}")
             return None
     
-    @staticmethod
-    def get_playlist_list() -> List[Dict[str, Any]]:
+    def get_playlist_list(self, guild_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get list of all available playlists with metadata.
+        Get playlists visible in guild, newest first, from metadata only.
         
+        Args:
+            guild_id: Guild namespace
+            limit: Maximum number of playlists to return
+            
         Returns:
             List of playlist info dicts
         """
-        playlists = []
-        
         try:
-            if not os.path.exists(BotConfig.PLAYLISTS_DIR):
-                return playlists
-            
-            playlist_files = [f for f in os.listdir(BotConfig.PLAYLISTS_DIR) 
-                            if f.endswith(".json")]
-            
-            for playlist_file in playlist_files:
-                try:
-                    name = playlist_file.replace(".json", "")
-                    file_path = f"{BotConfig.PLAYLISTS_DIR}/{playlist_file}"
-                    
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    
-                    playlist_info = {
-                        "name": name,
-                        "track_count": len(data.get("utwory", [])),
-                        "creator": data.get("utworzony_przez", "Unknown"),
-                        "created_date": data.get("utworzony_dnia", "Unknown")
-                    }
-                    
-                    playlists.append(playlist_info)
-                    
-                except Exception as e:
-                    Logger.log_error(e, f"READ_PLAYLIST_INFO: {playlist_file}")
-                    continue
-            
-        except Exception as e:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT name, track_count, creator, created FROM playlists p "
+                    "WHERE guild_id = ? OR (guild_id = ? AND NOT EXISTS ("
+                    "SELECT 1 FROM playlists o WHERE o.guild_id = ? AND o.name = p.name)) "
+                    "ORDER BY created DESC LIMIT ?",
+                    (guild_id, self.GLOBAL_NAMESPACE, guild_id, -1 if limit is None else limit)
+                ).fetchall()
+        except sqlite3.Error as e:
             Logger.log_error(e, "GET_PLAYLIST_LIST")
+            return []
         
-        return playlists
+        return [
+            {
+                "name": name,
+                "track_count": track_count,
+                "creator": creator,
+                "created_date": created
+            }
+            for name, track_count, creator, created in rows
+        ]
+    
+    def count_playlists(self, guild_id: int) -> int:
+        """Get number of playlists visible in guild."""
+        try:
+            with self._lock:
+                (count,) = self.conn.execute(
+                    "SELECT COUNT(DISTINCT name) FROM playlists WHERE guild_id IN (?, ?)",
+                    (guild_id, self.GLOBAL_NAMESPACE)
+                ).fetchone()
+            return count
+        except sqlite3.Error as e:
+            Logger.log_error(e, "COUNT_PLAYLISTS")
+            return 0
     
-    @staticmethod
-    def playlist_exists(name: str) -> bool:
-        """Check if playlist exists."""
-        file_path = f"{BotConfig.PLAYLISTS_DIR}/{name}.json"
-        return os.path.exists(file_path)
+    def playlist_exists(self, name: str, guild_id: int) -> bool:
+        """Check if playlist is visible in guild."""
+        try:
+            with self._lock:
+                return self._find(name, guild_id) is not None
+        except sqlite3.Error as e:
+            Logger.log_error(e, f"PLAYLIST_EXISTS: {name}")
+            return False
     
-    @staticmethod
-    def delete_playlist(name: str) -> bool:
+    def delete_playlist(self, name: str, guild_id: int) -> bool:
         """
-        Delete playlist file.
+        Delete playlist from guild's own namespace.
         
         Args:
             name: Playlist name
+            guild_id: Guild namespace
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            file_path = f"{BotConfig.PLAYLISTS_DIR}/{name}.json"
+            with self._lock, self.conn:
+                deleted = self.conn.execute(
+                    "DELETE FROM playlists WHERE guild_id = ? AND name = ?", (guild_id, name)
+                ).rowcount
+                self.conn.execute(
+                    "DELETE FROM playlist_tracks WHERE guild_id = ? AND name = ?", (guild_id, name)
+                )
             
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                Logger.log_info(f"Playlist '{name}' deleted", "PLAYLIST")
-                return True
+            if deleted:
+                Logger.log_info(f"Playlist '{name}' deleted (guild {guild_id})", "PLAYLIST")
+            return bool(deleted)
             
+        except sqlite3.Error as e:
+            Logger.log_error(e, f"DELETE_PLAYLIST: {name}")
             return False
+    
+    async def save_playlist_async(self, name: str, tracks: List[Track], creator: str, guild_id: int) -> bool:
+        """Save playlist off the event loop."""
+        return await asyncio.to_thread(self.save_playlist, name, list(tracks), creator, guild_id)
+    
+    async def append_tracks_async(
+        self,
+        name: str,
+        tracks: List[Track],
+        creator: str,
+        guild_id: int
+    ) -> Optional[int]:
+        """Append tracks to playlist off the event loop."""
+        return await asyncio.to_thread(self.append_tracks, name, list(tracks), creator, guild_id)
+    
+    async def load_playlist_async(
+        self,
+        name: str,
+        guild_id: int,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Load playlist off the event loop."""
+        return await asyncio.to_thread(self.load_playlist, name, guild_id, limit)
+    
+    async def get_playlist_list_async(self, guild_id: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List playlists off the event loop."""
+        return await asyncio.to_thread(self.get_playlist_list, guild_id, limit)
+    
+    async def count_playlists_async(self, guild_id: int) -> int:
+        """Count playlists off the event loop."""
+        return await asyncio.to_thread(self.count_playlists, guild_id)
+    
+    def import_json_files(self, directory: Optional[str] = None) -> int:
+        """
+        One-time import of legacy JSON playlists into the global namespace.
+        
+        Runs once per database; the JSON files are left in place as a backup.
+        Playlists that already exist in the global namespace are skipped.
+        
+        Returns:
+            Number of imported playlists
+        """
+        directory = directory or BotConfig.PLAYLISTS_DIR
+        
+        with self._lock:
+            done = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'json_imported'"
+            ).fetchone()
+            if done:
+                return 0
             
-        except Exception as e:
-            Logger.log_error(e, f"DELETE_PLAYLIST: {name}")
-            return False
\ No newline at end of file
+            imported = 0
+            playlist_files = []
+            if os.path.isdir(directory):
+                playlist_files = sorted(f for f in os.listdir(directory) if f.endswith(".json"))
+            
+            try:
+                with self.conn:
+                    for playlist_file in playlist_files:
+                        name = playlist_file[:-len(".json")]
+                        try:
+                            with open(os.path.join(directory, playlist_file), "r", encoding="utf-8") as f:
+                                data = json.load(f)
+                        except (OSError, ValueError) as e:
+                            Logger.log_error(e, f"IMPORT_PLAYLIST: {playlist_file}")
+                            continue
+                        
+                        if self.conn.execute(
+                            "SELECT 1 FROM playlists WHERE guild_id = ? AND name = ?",
+                            (self.GLOBAL_NAMESPACE, name)
+                        ).fetchone():
+                            continue
+                        
+                        rows = [
+                            (self.GLOBAL_NAMESPACE, name, position, json.dumps(track_data, ensure_ascii=False))
+                            for position, track_data in enumerate(data.get("utwory", []))
+                        ]
+                        self._write(
+                            self.GLOBAL_NAMESPACE, name,
+                            data.get("utworzony_przez", "Unknown"),
+                            data.get("utworzony_dnia", "Unknown"),
+                            rows
+                        )
+                        imported += 1
+                    
+                    self.conn.execute(
+                        "INSERT INTO meta (key, value) VALUES ('json_imported', ?)",
+                        (dt.datetime.now().isoformat(),)
+                    )
+            except sqlite3.Error as e:
+                Logger.log_error(e, "IMPORT_PLAYLISTS")
+                return 0
+        
+        if imported:
+            Logger.log_info(f"Imported {imported} JSON playlists into global namespace", "PLAYLIST")
+        return imported
+    
+    def close(self) -> None:
+        """Close database connection."""
+        with self._lock:
+            self.conn.close()
+    
+    def _write(self, guild_id: int, name: str, creator: str, created: str, rows: List[tuple]) -> None:
+        """Replace playlist rows; caller holds the lock and the transaction."""
+        self.conn.execute(
+            "DELETE FROM playlist_tracks WHERE guild_id = ? AND name = ?", (guild_id, name)
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO playlists (guild_id, name, creator, created, track_count) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (guild_id, name, creator, created, len(rows))
+        )
+        self.conn.executemany(
+            "INSERT INTO playlist_tracks (guild_id, name, position, data) VALUES (?, ?, ?, ?)", rows
+        )
+    
+    def _copy_to_namespace(self, name: str, source: int, target: int) -> None:
+        """Copy playlist with its tracks between namespaces; caller holds the lock."""
+        self.conn.execute(
+            "INSERT INTO playlists (guild_id, name, creator, created, track_count) "
+            "SELECT ?, name, creator, created, track_count FROM playlists WHERE guild_id = ? AND name = ?",
+            (target, source, name)
+        )
+        self.conn.execute(
+            "INSERT INTO playlist_tracks (guild_id, name, position, data) "
+            "SELECT ?, name, position, data FROM playlist_tracks WHERE guild_id = ? AND name = ?",
+            (target, source, name)
+        )
+    
+    def _find(self, name: str, guild_id: int) -> Optional[tuple]:
+        """Get (namespace, creator, created, track_count) of visible playlist; caller holds the lock."""
+        return self.conn.execute(
+            "SELECT guild_id, creator, created, track_count FROM playlists "
+            "WHERE name = ? AND guild_id IN (?, ?) "
+            "ORDER BY guild_id = ? LIMIT 1",
+            (name, guild_id, self.GLOBAL_NAMESPACE, self.GLOBAL_NAMESPACE)
+        ).fetchone()
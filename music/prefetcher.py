@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import asyncio
+from typing import Dict, Any, Iterable, Optional
+from config import BotConfig
+from utils.file_manager import FileManager
+from utils.logger import Logger
+from music.track import Track
+from music.async_downloader import AsyncYouTubeDownloader
+from music.download_scheduler import Priority
+
+class TrackPrefetcher:
+    """Keeps the next few queued tracks of every guild ready to play."""
+
+    def __init__(self, extractor: AsyncYouTubeDownloader, depth: Optional[int] = None):
+        self.extractor = extractor
+        self.depth = depth if depth is not None else BotConfig.PREFETCH_DEPTH
+        # guild_id -> track_id -> running prefetch task
+        self.tasks: Dict[int, Dict[str, asyncio.Task]] = {}
+        self.stats: Dict[str, int] = {
+            "started": 0,
+            "ready": 0,
+            "failed": 0,
+            "cancelled": 0,
+        }
+
+    @staticmethod
+    def is_ready(track: Track) -> bool:
+        """Check if track can start playing without any extraction."""
+        return track.has_fresh_stream() or FileManager.find_file(track.id) is not None
+
+    def refresh(self, guild_id: int, queue: Iterable[Track]) -> None:
+        """
+        Sync prefetch work with the head of guild's queue.
+
+        Tracks are started in queue order so the next song is always first in
+        line for a worker; work for tracks that left the window (removed,
+        skipped, queue cleared) is cancelled.
+        """
+        wanted = []
+        for track in queue:
+            if len(wanted) >= self.depth:
+                break
+            wanted.append(track)
+        wanted_ids = {track.id for track in wanted}
+
+        guild_tasks = self.tasks.setdefault(guild_id, {})
+        for track_id, task in list(guild_tasks.items()):
+            if track_id not in wanted_ids:
+                task.cancel()
+                del guild_tasks[track_id]
+                self.stats["cancelled"] += 1
+
+        for track in wanted:
+            if track.id in guild_tasks or self.is_ready(track):
+                continue
+            guild_tasks[track.id] = asyncio.create_task(self._prepare(guild_id, track))
+            self.stats["started"] += 1
+
+    async def wait_for(self, guild_id: int, track: Track) -> None:
+        """Wait for in-flight prefetch of track, taking it out of the window."""
+        task = self.tasks.get(guild_id, {}).pop(track.id, None)
+        if task is not None and not task.done():
+            # wait() neither raises task errors nor cancels the task on our cancellation
+            await asyncio.wait({task})
+
+    def cancel_guild(self, guild_id: int) -> None:
+        """Cancel all prefetch work for guild."""
+        for task in self.tasks.pop(guild_id, {}).values():
+            task.cancel()
+            self.stats["cancelled"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch statistics."""
+        in_flight = sum(len(guild_tasks) for guild_tasks in self.tasks.values())
+        return {"depth": self.depth, "in_flight": in_flight, **self.stats}
+
+    async def _prepare(self, guild_id: int, track: Track) -> None:
+        """Resolve fresh stream URL (or download the file) for track."""
+        try:
+            if BotConfig.STREAM_PLAYBACK:
+                track.set_stream(*await self.extractor.resolve_stream(
+                    track.url, guild_id=guild_id, priority=Priority.PREFETCH
+                ))
+                ready = track.stream_url is not None
+            else:
+                info = await self.extractor.extract_info(
+                    track.url, download=True, guild_id=guild_id, priority=Priority.PREFETCH
+                )
+                ready = info is not None
+
+            if ready:
+                self.stats["ready"] += 1
+            else:
+                self.stats["failed"] += 1
+                Logger.log_warning(f"Prefetch failed: {track.url}", "PREFETCH")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            Logger.log_error(e, f"PREFETCH: {track.url}")
+        finally:
+            guild_tasks = self.tasks.get(guild_id, {})
+            if guild_tasks.get(track.id) is asyncio.current_task():
+                del guild_tasks[track.id]
@@ -1,31 +1,60 @@
 #!/usr/bin/env python3
 
-from typing import Dict, List, Optional, Set
-from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional
 from music.track import Track
+from music.track_queue import TrackQueue
 
 class QueueManager:
     """Manages music queues for different guilds."""
     
-    def __init__(self):
-        self.queues: Dict[int, List[Track]] = {}
+    def __init__(
+        self,
+        on_acquire: Optional[Callable[[str], None]] = None,
+        on_release: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            on_acquire: Called with track ID when it becomes queued or playing anywhere
+            on_release: Called with track ID when nothing references it anymore
+        """
+        self.queues: Dict[int, TrackQueue] = {}
         self.current_tracks: Dict[int, Optional[Track]] = {}
         self.loop_status: Dict[int, bool] = {}
+        
+        # track_id -> number of queue entries and current tracks referencing it
+        self.refcounts: Dict[str, int] = {}
+        self.on_acquire = on_acquire
+        self.on_release = on_release
     
     def add_track(self, guild_id: int, track: Track) -> None:
         """Add track to guild's queue."""
         if guild_id not in self.queues:
-            self.queues[guild_id] = []
+            self.queues[guild_id] = TrackQueue()
         self.queues[guild_id].append(track)
+        self._acquire(track)
     
     def add_tracks(self, guild_id: int, tracks: List[Track]) -> None:
         """Add multiple tracks to guild's queue."""
         if guild_id not in self.queues:
-            self.queues[guild_id] = []
+            self.queues[guild_id] = TrackQueue()
         self.queues[guild_id].extend(tracks)
+        for track in tracks:
+            self._acquire(track)
+    
+    def add_track_front(self, guild_id: int, track: Track) -> None:
+        """Put track at the head of guild's queue (used by loop mode)."""
+        if guild_id not in self.queues:
+            self.queues[guild_id] = TrackQueue()
+        self.queues[guild_id].appendleft(track)
+        self._acquire(track)
     
     def get_next_track(self, guild_id: int, position: int = 0) -> Optional[Track]:
-        """Get next track from queue and remove it."""
+        """
+        Get next track from queue and remove it.
+        
+        The track keeps its reference so its cached file cannot be evicted
+        in between; pass it to set_current_track(), which takes it over.
+        """
         if guild_id not in self.queues or not self.queues[guild_id]:
             return None
         
@@ -41,24 +70,63 @@ class QueueManager:
             position < 0):
             return None
         
-        return self.queues[guild_id].pop(position)
+        track = self.queues[guild_id].pop(position)
+        if track:
+            self._release(track)
+        return track
     
-    def get_queue(self, guild_id: int) -> List[Track]:
+    def move_track(self, guild_id: int, source: int, target: int) -> bool:
+        """Move track from source to target position."""
+        if guild_id not in self.queues:
+            return False
+        return self.queues[guild_id].move(source, target)
+    
+    def shuffle_queue(self, guild_id: int) -> None:
+        """Shuffle guild's queue."""
+        if guild_id in self.queues:
+            self.queues[guild_id].shuffle()
+    
+    def remove_user_tracks(self, guild_id: int, owner: Hashable) -> List[Track]:
+        """Remove all tracks added by owner (user ID, or name for legacy tracks) and return them in queue order."""
+        if guild_id not in self.queues:
+            return []
+        tracks = self.queues[guild_id].remove_user(owner)
+        for track in tracks:
+            self._release(track)
+        return tracks
+    
+    def count_user_tracks(self, guild_id: int, owner: Hashable) -> int:
+        """Get number of queued tracks added by owner (user ID, or name for legacy tracks)."""
+        if guild_id not in self.queues:
+            return 0
+        return self.queues[guild_id].count_user(owner)
+    
+    def get_queue(self, guild_id: int) -> TrackQueue:
         """Get guild's current queue."""
-        return self.queues.get(guild_id, [])
+        queue = self.queues.get(guild_id)
+        return queue if queue is not None else TrackQueue()
     
     def get_queue_length(self, guild_id: int) -> int:
         """Get length of guild's queue."""
-        return len(self.queues.get(guild_id, []))
+        queue = self.queues.get(guild_id)
+        return len(queue) if queue is not None else 0
     
     def clear_queue(self, guild_id: int) -> None:
         """Clear guild's queue."""
         if guild_id in self.queues:
+            for track in self.queues[guild_id]:
+                self._release(track)
             self.queues[guild_id].clear()
     
     def set_current_track(self, guild_id: int, track: Optional[Track]) -> None:
-        """Set currently playing track."""
+        """
+        Set currently playing track, taking over the reference handed out
+        by get_next_track() and releasing the previous one.
+        """
+        previous = self.current_tracks.get(guild_id)
         self.current_tracks[guild_id] = track
+        if previous:
+            self._release(previous)
     
     def get_current_track(self, guild_id: int) -> Optional[Track]:
         """Get currently playing track."""
@@ -78,24 +146,25 @@ class QueueManager:
         self.loop_status[guild_id] = not current_status
         return self.loop_status[guild_id]
     
-    def get_all_active_track_ids(self) -> Set[str]:
-        """Get all active track IDs across all guilds."""
-        active_ids = set()
-        
-        # Add IDs from queues
-        for queue in self.queues.values():
-            for track in queue:
-                active_ids.add(track.id)
-        
-        # Add IDs from current tracks
-        for track in self.current_tracks.values():
-            if track:
-                active_ids.add(track.id)
-        
-        return active_ids
-    
     def has_content(self, guild_id: int) -> bool:
         """Check if guild has any tracks in queue or currently playing."""
         has_queue = guild_id in self.queues and bool(self.queues[guild_id])
         has_current = guild_id in self.current_tracks and bool(self.current_tracks[guild_id])
-        return has_queue or has_current
\ No newline at end of file
+        return has_queue or has_current
+    
+    def _acquire(self, track: Track) -> None:
+        """Count new reference to track."""
+        count = self.refcounts.get(track.id, 0)
+        self.refcounts[track.id] = count + 1
+        if count == 0 and self.on_acquire:
+            self.on_acquire(track.id)
+    
+    def _release(self, track: Track) -> None:
+        """Drop reference to track, notifying once the last one is gone."""
+        count = self.refcounts.get(track.id, 0) - 1
+        if count > 0:
+            self.refcounts[track.id] = count
+            return
+        self.refcounts.pop(track.id, None)
+        if self.on_release:
+            self.on_release(track.id)
\ No newline at end of file
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from config import BotConfig
+from utils.logger import Logger
+from utils.metrics import REGISTRY
+
+CACHE_LOOKUPS = REGISTRY.counter("musicbot_cache_lookups_total", "Cache lookups", ("cache", "result"))
+
+class SearchCache:
+    """Size-bounded LRU cache of YouTube search results with TTL and an SQLite snapshot."""
+
+    # Fields worth keeping from yt-dlp entries; format lists and stream URLs
+    # are large and expire long before the cache entry does
+    ENTRY_FIELDS = ("_type", "ie_key", "id", "title", "uploader", "channel", "duration", "webpage_url")
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        db_path: Optional[str] = None
+    ):
+        self.max_entries = max_entries or BotConfig.SEARCH_CACHE_MAX_ENTRIES
+        self.ttl = ttl or BotConfig.SEARCH_CACHE_EXPIRY
+        self.db_path = db_path or BotConfig.SEARCH_CACHE_FILE
+
+        # key -> (created_at, value), oldest access first
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        # Lookups happen on extraction worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize query: case, punctuation and whitespace do not matter."""
+        return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached value, refreshing its LRU position."""
+        with self._lock:
+            item = self.entries.get(key)
+            if item is None or time.time() - item[0] >= self.ttl:
+                if item is not None:
+                    del self.entries[key]
+                self.stats["misses"] += 1
+                CACHE_LOOKUPS.inc(cache="search", result="miss")
+                return None
+
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            CACHE_LOOKUPS.inc(cache="search", result="hit")
+            return item[1]
+
+    def put(self, key: str, value: Any) -> Any:
+        """
+        Store slimmed copy of value, evicting least recently used entries.
+
+        Returns:
+            The slimmed value that was stored
+        """
+        value = self.slim(value)
+        with self._lock:
+            self.entries[key] = (time.time(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return value
+
+    def expire(self) -> int:
+        """Remove expired entries and return their count."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [key for key, (created, _) in self.entries.items() if created < cutoff]
+            for key in expired:
+                del self.entries[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def load(self) -> int:
+        """
+        Load snapshot saved by a previous run, skipping expired entries.
+
+        Returns:
+            Number of loaded entries
+        """
+        if not os.path.exists(self.db_path):
+            return 0
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT key, created, value FROM search_cache WHERE created > ? "
+                    "ORDER BY accessed DESC LIMIT ?",
+                    (time.time() - self.ttl, self.max_entries)
+                ).fetchall()
+        except sqlite3.Error as e:
+            Logger.log_error(e, "SEARCH_CACHE_LOAD")
+            return 0
+
+        with self._lock:
+            # Rows come most recent first, insert oldest first to keep LRU order
+            for key, created, value in reversed(rows):
+                self.entries[key] = (created, json.loads(value))
+
+        Logger.log_info(f"Loaded {len(rows)} cached searches", "SEARCH_CACHE")
+        return len(rows)
+
+    def save(self) -> None:
+        """Replace on-disk snapshot with the current cache content."""
+        with self._lock:
+            rows = [
+                (key, created, position, json.dumps(value, ensure_ascii=False))
+                for position, (key, (created, value)) in enumerate(self.entries.items())
+            ]
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache "
+                    "(key TEXT PRIMARY KEY, created REAL, accessed INTEGER, value TEXT)"
+                )
+                conn.execute("DELETE FROM search_cache")
+                conn.executemany("INSERT INTO search_cache VALUES (?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            Logger.log_error(e, "SEARCH_CACHE_SAVE")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            hit_rate = self.stats["hits"] / lookups * 100 if lookups else 0.0
+            return {
+                "entries": f"{len(self.entries)} / {self.max_entries}",
+                "hit_rate": f"{hit_rate:.1f}%",
+                **self.stats,
+            }
+
+    @classmethod
+    def slim(cls, value: Any) -> Any:
+        """Strip entry dicts (or lists of them) down to ENTRY_FIELDS."""
+        if isinstance(value, list):
+            return [cls.slim(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        slim = {field: value[field] for field in cls.ENTRY_FIELDS if value.get(field) is not None}
+        # Lazy url results need their page URL to be processed later
+        if value.get("_type") == "url" and value.get("url"):
+            slim["url"] = value["url"]
+        return slim
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import asyncio
+from typing import Dict, Any, Awaitable, Callable
+
+class _Flight:
+    """In-flight call shared by every caller with the same key."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesces concurrent async calls with the same key into a single execution."""
+
+    def __init__(self):
+        self.in_flight: Dict[str, _Flight] = {}
+        self.stats: Dict[str, int] = {"executed": 0, "coalesced": 0}
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await the in-flight call for key, starting it if there is none.
+
+        The shared call survives cancellation of individual callers and is
+        only cancelled when the last caller waiting for it goes away.
+        """
+        flight = self.in_flight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self.in_flight[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, task))
+            self.stats["executed"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        return {"in_flight": len(self.in_flight), **self.stats}
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Forget finished call so the next request starts a fresh one."""
+        flight = self.in_flight.get(key)
+        if flight is not None and flight.task is task:
+            del self.in_flight[key]
+        if not task.cancelled():
+            # Mark exception as retrieved even if every caller was cancelled
+            task.exception()
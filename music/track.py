@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
 
 import datetime as dt
+import sys
+import time
+from functools import lru_cache
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from config import BotConfig
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _format_duration(seconds: int) -> str:
+    """Format duration as H:MM:SS, shared by all tracks of the same length."""
+    return str(dt.timedelta(seconds=seconds))
+
+@dataclass(slots=True)
 class Track:
-    """Represents a music track with all its metadata."""
+    """
+    Represents a music track with all its metadata.
+    
+    Slotted to avoid a per-instance __dict__; uploader and requester names
+    repeat across many tracks and are interned so equal names share one
+    string object. Not frozen because playback state and ownership are
+    updated in place.
+    """
     
     url: str
     title: str
@@ -15,9 +30,20 @@ class Track:
     duration: int
     id: str
     user: str
+    # Discord ID of the requester; None for AutoDJ and tracks saved before it was recorded
+    user_id: Optional[int] = None
+    
+    # Playback state, never serialized
+    stream_url: Optional[str] = field(default=None, repr=False, compare=False)
+    stream_expires: float = field(default=0.0, repr=False, compare=False)
+    codec: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self.uploader = sys.intern(self.uploader)
+        self.user = sys.intern(self.user)
     
     @classmethod
-    def from_yt_info(cls, info: Dict[str, Any], username: str) -> 'Track':
+    def from_yt_info(cls, info: Dict[str, Any], username: str, user_id: Optional[int] = None) -> 'Track':
         """Create Track from yt-dlp info dict with validation."""
         # Validate required fields
         required_fields = ['id', 'title', 'uploader', 'duration']
@@ -39,12 +65,29 @@ class Track:
             uploader=str(info['uploader']),
             duration=int(duration),
             id=str(info['id']),
-            user=username
+            user=username,
+            user_id=user_id
         )
     
+    def set_owner(self, user: str, user_id: Optional[int]) -> None:
+        """Hand track over to another requester, keeping the name interned."""
+        self.user = sys.intern(user)
+        self.user_id = user_id
+    
+    def set_stream(self, stream_url: Optional[str], codec: Optional[str] = None) -> None:
+        """Remember resolved media URL (and its audio codec) for streaming playback."""
+        self.stream_url = stream_url
+        self.stream_expires = time.time() + BotConfig.STREAM_URL_TTL if stream_url else 0.0
+        if codec:
+            self.codec = codec
+    
+    def has_fresh_stream(self) -> bool:
+        """Check if resolved media URL is still usable."""
+        return bool(self.stream_url) and time.time() < self.stream_expires
+    
     def get_duration_string(self) -> str:
         """Get formatted duration string."""
-        return str(dt.timedelta(seconds=self.duration))
+        return _format_duration(self.duration)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -54,10 +97,19 @@ class Track:
             'uploader': self.uploader,
             'duration': self.duration,
             'id': self.id,
-            'user': self.user
+            'user': self.user,
+            'user_id': self.user_id
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Track':
-        """Create Track from dictionary."""
-        return cls(**data)
\ No newline at end of file
+        """Create Track from dictionary (older playlists have no user_id)."""
+        return cls(
+            url=data['url'],
+            title=data['title'],
+            uploader=data['uploader'],
+            duration=data['duration'],
+            id=data['id'],
+            user=data['user'],
+            user_id=data.get('user_id')
+        )
\ No newline at end of file
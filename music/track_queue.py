@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+import random
+from collections import deque
+from typing import Dict, Deque, Hashable, Iterable, Iterator, List, Optional, Set
+from music.track import Track
+
+class _Entry:
+    """Queue slot; removed slots stay in place until the next compaction."""
+
+    __slots__ = ("track", "alive", "seq")
+
+    def __init__(self, track: Track, seq: float):
+        self.track = track
+        self.alive = True
+        # Grows from head to tail, orders entries found through the user index
+        self.seq = seq
+
+class TrackQueue:
+    """
+    Guild playback queue backed by a deque with a per-user index.
+
+    Head and tail operations are O(1). Removing all tracks of a user only
+    touches that user's entries: they are marked dead and skipped, and the
+    deque is compacted lazily once dead entries pile up or positions are
+    needed.
+
+    Positional access (__getitem__, pop(position > 0), move) stays O(n):
+    deque indexing walks from the nearer end and compaction rebuilds the
+    deque. Shuffle is O(n) as well.
+    """
+
+    def __init__(self, tracks: Iterable[Track] = ()):
+        self._entries: Deque[_Entry] = deque()
+        # owner (user ID, or name for tracks without one) -> live entries
+        self._by_user: Dict[Hashable, Set[_Entry]] = {}
+        self._dead = 0
+        self.extend(tracks)
+
+    def __len__(self) -> int:
+        return len(self._entries) - self._dead
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Track]:
+        return (entry.track for entry in self._entries if entry.alive)
+
+    def __getitem__(self, position: int) -> Track:
+        self._compact()
+        return self._entries[position].track
+
+    def append(self, track: Track) -> None:
+        """Add track at the end."""
+        entry = _Entry(track, self._entries[-1].seq + 1 if self._entries else 0)
+        self._entries.append(entry)
+        self._index(entry)
+
+    def appendleft(self, track: Track) -> None:
+        """Add track at the head."""
+        entry = _Entry(track, self._entries[0].seq - 1 if self._entries else 0)
+        self._entries.appendleft(entry)
+        self._index(entry)
+
+    def extend(self, tracks: Iterable[Track]) -> None:
+        """Add tracks at the end."""
+        for track in tracks:
+            self.append(track)
+
+    def popleft(self) -> Optional[Track]:
+        """Remove and return head track, or None if empty."""
+        while self._entries:
+            entry = self._entries.popleft()
+            if entry.alive:
+                self._unindex(entry)
+                return entry.track
+            self._dead -= 1
+        return None
+
+    def pop(self, position: int = 0) -> Optional[Track]:
+        """Remove and return track at position, or None if out of range."""
+        if position == 0:
+            return self.popleft()
+        if not 0 <= position < len(self):
+            return None
+
+        self._compact()
+        entry = self._entries[position]
+        del self._entries[position]
+        self._unindex(entry)
+        return entry.track
+
+    def peek(self, count: int) -> List[Track]:
+        """Get first count tracks without removing them."""
+        tracks = []
+        for track in self:
+            if len(tracks) >= count:
+                break
+            tracks.append(track)
+        return tracks
+
+    def move(self, source: int, target: int) -> bool:
+        """Move track from source to target position."""
+        if not (0 <= source < len(self) and 0 <= target < len(self)):
+            return False
+
+        self._compact()
+        entry = self._entries[source]
+        del self._entries[source]
+        self._entries.insert(target, entry)
+        self._place(target)
+        return True
+
+    def shuffle(self) -> None:
+        """Shuffle queue order."""
+        entries = [entry for entry in self._entries if entry.alive]
+        random.shuffle(entries)
+        self._entries = deque(entries)
+        self._dead = 0
+        self._renumber()
+
+    def count_user(self, owner: Hashable) -> int:
+        """Get number of queued tracks added by owner (see owner_of)."""
+        return len(self._by_user.get(owner, ()))
+
+    def remove_user(self, owner: Hashable) -> List[Track]:
+        """Remove all tracks added by owner (see owner_of) and return them in queue order."""
+        entries = self._by_user.pop(owner, set())
+        for entry in entries:
+            entry.alive = False
+        self._dead += len(entries)
+
+        # Keep dead entries from dominating the deque
+        if self._dead > len(self):
+            self._compact()
+        return [entry.track for entry in sorted(entries, key=lambda entry: entry.seq)]
+
+    def clear(self) -> None:
+        """Remove all tracks."""
+        self._entries.clear()
+        self._by_user.clear()
+        self._dead = 0
+
+    @staticmethod
+    def owner_of(track: Track) -> Hashable:
+        """Get index key of track's requester: user ID, or name when the ID is unknown."""
+        return track.user_id if track.user_id is not None else track.user
+
+    def _index(self, entry: _Entry) -> None:
+        """Add entry to user index."""
+        self._by_user.setdefault(self.owner_of(entry.track), set()).add(entry)
+
+    def _unindex(self, entry: _Entry) -> None:
+        """Remove entry from user index."""
+        owner = self.owner_of(entry.track)
+        user_entries = self._by_user.get(owner)
+        if user_entries is not None:
+            user_entries.discard(entry)
+            if not user_entries:
+                del self._by_user[owner]
+
+    def _compact(self) -> None:
+        """Drop dead entries so positions map directly onto the deque."""
+        if self._dead:
+            self._entries = deque(entry for entry in self._entries if entry.alive)
+            self._dead = 0
+
+    def _place(self, position: int) -> None:
+        """Give moved entry a sequence number between its new neighbours."""
+        entry = self._entries[position]
+        before = self._entries[position - 1].seq if position > 0 else None
+        after = self._entries[position + 1].seq if position + 1 < len(self._entries) else None
+        if before is None:
+            if after is not None:
+                entry.seq = after - 1
+        elif after is None:
+            entry.seq = before + 1
+        else:
+            entry.seq = (before + after) / 2
+            # Repeated moves into the same gap run out of float precision
+            if not before < entry.seq < after:
+                self._renumber()
+
+    def _renumber(self) -> None:
+        """Restore evenly spaced sequence numbers."""
+        for seq, entry in enumerate(self._entries):
+            entry.seq = seq
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import time
+import threading
+import yt_dlp
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from config import BotConfig
+from utils.logger import Logger
+
+class YoutubeDLPool:
+    """
+    Pool of configured YoutubeDL instances per extraction profile.
+
+    A YoutubeDL instance is not safe to share between threads, so every
+    extraction checks one out for exclusive use and returns it afterwards.
+    Returned instances keep their initialised extractors and HTTP sessions,
+    so later extractions skip the cold start.
+    """
+
+    def __init__(
+        self,
+        profile_opts: Dict[str, Dict[str, Any]],
+        size: Optional[int] = None,
+        prewarm: Optional[Iterable[str]] = None
+    ):
+        self.profile_opts = profile_opts
+        self.size = size or BotConfig.YDL_POOL_SIZE
+
+        # Most recently returned instance is handed out first (warmest)
+        self.idle: Dict[str, List[yt_dlp.YoutubeDL]] = {profile: [] for profile in profile_opts}
+        self.created: Dict[str, int] = {profile: 0 for profile in profile_opts}
+        self.stats: Dict[str, int] = {"checkouts": 0, "reused": 0, "waits": 0}
+        self.wait_time = 0.0
+        self.closed = False
+        self._cond = threading.Condition()
+
+        for profile in prewarm if prewarm is not None else BotConfig.YDL_POOL_PREWARM:
+            for _ in range(self.size):
+                self.idle[profile].append(self._create(profile))
+
+    @contextmanager
+    def acquire(self, profile: str) -> Iterator[yt_dlp.YoutubeDL]:
+        """Check out an instance of profile for exclusive use, blocking while all are busy."""
+        ydl = self._checkout(profile)
+        try:
+            yield ydl
+        finally:
+            self._checkin(profile, ydl)
+
+    def close(self) -> None:
+        """Close idle instances; busy ones are closed when returned."""
+        with self._cond:
+            self.closed = True
+            idle = [ydl for instances in self.idle.values() for ydl in instances]
+            for profile, instances in self.idle.items():
+                self.created[profile] -= len(instances)
+                instances.clear()
+
+        for ydl in idle:
+            self._close(ydl)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics."""
+        with self._cond:
+            stats = {
+                profile: f"{self.created[profile] - len(self.idle[profile])} busy, "
+                         f"{len(self.idle[profile])} idle / {self.size}"
+                for profile in self.profile_opts
+            }
+            stats.update(self.stats)
+            stats["wait_time"] = f"{self.wait_time:.2f}s"
+            return stats
+
+    def _checkout(self, profile: str) -> yt_dlp.YoutubeDL:
+        """Take idle instance, create one below the size limit or wait for a return."""
+        with self._cond:
+            self.stats["checkouts"] += 1
+            if not self.idle[profile] and self.created[profile] >= self.size:
+                self.stats["waits"] += 1
+                started = time.perf_counter()
+                while not self.idle[profile] and self.created[profile] >= self.size:
+                    self._cond.wait()
+                self.wait_time += time.perf_counter() - started
+
+            if self.idle[profile]:
+                self.stats["reused"] += 1
+                return self.idle[profile].pop()
+
+            # Reserve the slot before building outside the lock
+            self.created[profile] += 1
+
+        try:
+            return yt_dlp.YoutubeDL(self.profile_opts[profile])
+        except Exception:
+            with self._cond:
+                self.created[profile] -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, profile: str, ydl: yt_dlp.YoutubeDL) -> None:
+        """Return instance to the pool."""
+        with self._cond:
+            if not self.closed:
+                self.idle[profile].append(ydl)
+                self._cond.notify()
+                return
+            self.created[profile] -= 1
+        self._close(ydl)
+
+    def _create(self, profile: str) -> yt_dlp.YoutubeDL:
+        """Build instance up front (pre-warm)."""
+        self.created[profile] += 1
+        return yt_dlp.YoutubeDL(self.profile_opts[profile])
+
+    @staticmethod
+    def _close(ydl: yt_dlp.YoutubeDL) -> None:
+        """Release instance's network resources."""
+        try:
+            ydl.close()
+        except Exception as e:
+            Logger.log_error(e, "YDL_POOL_CLOSE")
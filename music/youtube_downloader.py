@@ -1,32 +1,92 @@
 #!/usr/bin/env python3
 
+import os
 import re
 import time
-import yt_dlp
-from typing import Dict, Any, List, Optional, Tuple
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Deque, Iterator, List, Optional, Tuple
 from config import BotConfig
 from utils.logger import Logger
+from utils.audio_cache import AudioCache
+from utils.metrics import REGISTRY
+from music.search_cache import SearchCache
+from music.negative_cache import NegativeCache
+from music.circuit_breaker import CircuitBreaker
+from music.ydl_pool import YoutubeDLPool
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "musicbot_extraction_stage_seconds", "Duration of track pipeline stages", ("stage",)
+)
+DOWNLOADED_BYTES = REGISTRY.counter("musicbot_download_bytes_total", "Bytes of audio downloaded")
+DOWNLOAD_SPEED = REGISTRY.histogram(
+    "musicbot_download_speed_bytes_per_second", "Throughput of single downloads",
+    buckets=(64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2)
+)
+
+# yt-dlp messages of videos that stay unplayable on retry. Transient errors
+# ("HTTP Error 503: Service Unavailable", "temporarily unavailable") must not
+# match, they would keep a playable video in the negative cache for hours.
+PERMANENT_ERRORS = (
+    "video unavailable",
+    "private video",
+    "this video is not available",
+    "has been removed",
+    "playlist does not exist",
+)
+
+class _DownloadSlot:
+    """Download of one video, held by the worker that fetches it."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
 
 class YouTubeDownloader:
     """Handles YouTube content extraction and caching with yt-dlp 2025.11.12 features."""
     
     def __init__(self):
         # Use simplified configuration for reliability
-        opts = BotConfig.YDL_OPTS.copy()
+        self.profile_opts = self._build_profile_opts()
+        # Each extraction checks out its own instance, sharing one across threads is unsafe
+        self.ydl_pool = YoutubeDLPool(self.profile_opts)
+        self.negative_cache = NegativeCache()
+        self.circuit_breaker = CircuitBreaker()
+        self.search_cache = SearchCache()
+        self.search_cache.load()
+        self.audio_cache = AudioCache()
         
-        # Add file size limit if configured
-        if hasattr(BotConfig, 'MAX_DOWNLOAD_SIZE') and BotConfig.MAX_DOWNLOAD_SIZE:
-            opts["max_filesize"] = BotConfig.MAX_DOWNLOAD_SIZE
-            
-        self.ydl = yt_dlp.YoutubeDL(opts)
-        self.search_cache: Dict[str, Tuple[float, Any]] = {}
-        self.cache_expiry = BotConfig.SEARCH_CACHE_EXPIRY
+        # Recent per-stage durations of the resolve/fetch pipeline
+        self.stage_timings: Dict[str, Deque[float]] = {}
+        self._timings_lock = threading.Lock()
+        
+        # video_id -> download in progress, waited on by other workers
+        self._download_slots: Dict[str, _DownloadSlot] = {}
+        self._slots_lock = threading.Lock()
     
     def is_youtube_link(self, text: str) -> bool:
         """Check if text is a YouTube URL."""
         pattern = re.compile(r"(https?://)?(www\.)?(youtube|youtu)\.(com|be)/.+$")
         return pattern.match(text) is not None
     
+    @staticmethod
+    def get_video_id(url: str) -> Optional[str]:
+        """Get 11-character video ID from a YouTube URL."""
+        match = re.search(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([\w-]{11})", url)
+        return match.group(1) if match else None
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize search query so equivalent queries share cache and in-flight work."""
+        return SearchCache.normalize(query)
+    
+    @staticmethod
+    def get_playlist_id(url: str) -> Optional[str]:
+        """Get playlist ID from a YouTube playlist URL."""
+        match = re.search(r"[?&]list=([\w-]+)", url)
+        return match.group(1) if match else None
+    
     def is_youtube_playlist_link(self, text: str) -> bool:
         """Check if text is a YouTube playlist URL."""
         pattern = re.compile(
@@ -34,169 +94,502 @@ class YouTubeDownloader:
         )
         return pattern.match(text) is not None
     
-    def extract_info(self, url: str, download: bool = True) -> Optional[Dict[str, Any]]:
-        """Extract information from URL with improved error handling and fallback mechanisms."""
-        try:
-            Logger.log_info(f"Extracting {'with download' if download else 'metadata only'}: {url}", "YOUTUBE")
-            result = self.ydl.extract_info(url, download=download)
-            if result:
-                Logger.log_info(f"Successfully extracted: {result.get('title', 'Unknown')}", "YOUTUBE")
-            return result
-        except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Check if it's a bot detection error
-            if "sign in to confirm" in error_msg or "not a bot" in error_msg:
-                Logger.log_warning("YouTube bot detection triggered, trying fallback method", "YOUTUBE")
-                return self._try_fallback_extraction(url, download)
+    def extract_info(self, url: str, download: bool = True, process: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Extract information from URL with improved error handling and fallback mechanisms.
+        
+        With process=False only the extractor runs (no format selection, no
+        download); the result can be finished later with process_result().
+        """
+        video_id = self.get_video_id(url)
+        if self._is_known_dead(video_id, url):
+            return None
+        
+        with self._download_slot(video_id, download) as download:
+            started = time.perf_counter()
+            if not self.circuit_breaker.allow("primary"):
+                result = self._try_fallback_extraction(url, download)
+            else:
+                try:
+                    Logger.log_info(f"Extracting {'with download' if download else 'metadata only'}: {url}", "YOUTUBE")
+                    with self.ydl_pool.acquire("primary") as ydl:
+                        result = ydl.extract_info(url, download=download, process=process)
+                    self.circuit_breaker.record_success("primary")
+                    if result:
+                        Logger.log_info(f"Successfully extracted: {result.get('title', 'Unknown')}", "YOUTUBE")
+                except Exception as e:
+                    result = self._handle_extraction_error(e, url, video_id, download)
             
-            # Check if it's a private/unavailable video
-            elif "private video" in error_msg or "unavailable" in error_msg:
-                Logger.log_warning(f"Video unavailable: {url}", "YOUTUBE")
-                return None
+            if download and result:
+                self._register_download(result, time.perf_counter() - started)
+        return result
+    
+    def process_result(self, ie_result: Dict[str, Any], download: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Finish an unprocessed extractor result: select formats and optionally download.
+        
+        Reuses the info dict from extract_info(process=False) instead of
+        extracting the same page again. Lazy url results (e.g. search entries)
+        are extracted exactly once here.
+        """
+        url = ie_result.get('webpage_url') or ie_result.get('url') or ie_result.get('id', 'unknown')
+        video_id = ie_result.get('id')
+        if self._is_known_dead(video_id, url):
+            return None
+        
+        with self._download_slot(video_id, download) as download:
+            started = time.perf_counter()
+            if not self.circuit_breaker.allow("primary"):
+                result = self._try_fallback_extraction(url, download)
+            else:
+                try:
+                    with self.ydl_pool.acquire("primary") as ydl:
+                        result = ydl.process_ie_result(ie_result, download=download)
+                    self.circuit_breaker.record_success("primary")
+                    if result:
+                        Logger.log_info(f"Successfully processed: {result.get('title', 'Unknown')}", "YOUTUBE")
+                except Exception as e:
+                    result = self._handle_extraction_error(e, url, video_id, download)
             
-            Logger.log_error(e, f"YOUTUBE_EXTRACT: {url}")
+            if download and result:
+                self._register_download(result, time.perf_counter() - started)
+        return result
+    
+    @contextmanager
+    def _download_slot(self, video_id: Optional[str], download: bool) -> Iterator[bool]:
+        """
+        Let only one worker at a time download a video; yields the download flag to use.
+        
+        Requests reaching the same video by different paths (link, search,
+        prefetch) would otherwise write the same .part file concurrently.
+        A worker that waited for the slot finds the audio cached and only
+        fetches metadata.
+        """
+        if not (download and video_id):
+            yield download
+            return
+        
+        with self._slots_lock:
+            slot = self._download_slots.setdefault(video_id, _DownloadSlot())
+            slot.users += 1
+        try:
+            with slot.lock:
+                yield not self.audio_cache.contains(video_id)
+        finally:
+            with self._slots_lock:
+                slot.users -= 1
+                if not slot.users:
+                    del self._download_slots[video_id]
+    
+    def _register_download(self, info: Dict[str, Any], elapsed: float) -> None:
+        """Add downloaded file described by info dict to the audio cache and record throughput."""
+        for download in info.get('requested_downloads') or []:
+            file_path = download.get('filepath')
+            if file_path and os.path.exists(file_path):
+                self.audio_cache.register(
+                    info['id'], file_path, download.get('acodec') or self.get_audio_codec(info)
+                )
+                size = os.path.getsize(file_path)
+                DOWNLOADED_BYTES.inc(size)
+                if elapsed > 0:
+                    DOWNLOAD_SPEED.observe(size / elapsed)
+                return
+    
+    def _is_known_dead(self, video_id: Optional[str], url: str) -> bool:
+        """Check negative cache so known private/unavailable videos or playlists are not extracted again."""
+        reason = self.negative_cache.get(video_id)
+        if reason is None:
+            return False
+        Logger.log_info(f"Skipping known unavailable content ({reason}): {url}", "YOUTUBE")
+        return True
+    
+    @staticmethod
+    def _classify_error(error: Exception) -> Optional[str]:
+        """
+        Classify extraction failure.
+        
+        Returns:
+            "bot_detection", "unavailable" (permanently) or None for other
+            errors, e.g. network failures and 5xx responses
+        """
+        error_msg = str(error).lower()
+        if "sign in to confirm" in error_msg or "not a bot" in error_msg:
+            return "bot_detection"
+        if any(message in error_msg for message in PERMANENT_ERRORS):
+            return "unavailable"
+        return None
+    
+    def _handle_extraction_error(
+        self,
+        error: Exception,
+        url: str,
+        video_id: Optional[str],
+        download: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Classify failure of the primary profile and run fallback extraction when it may help."""
+        kind = self._classify_error(error)
+        
+        # Check if it's a bot detection error
+        if kind == "bot_detection":
+            self.circuit_breaker.record_failure("primary")
+            Logger.log_warning("YouTube bot detection triggered, trying fallback method", "YOUTUBE")
+            return self._try_fallback_extraction(url, download)
+        
+        # Check if it's a private/unavailable video
+        if kind == "unavailable":
+            # YouTube answered, so the client itself got through
+            self.circuit_breaker.record_success("primary")
+            self.negative_cache.add(video_id, str(error).splitlines()[0][:200])
+            Logger.log_warning(f"Video unavailable: {url}", "YOUTUBE")
             return None
+        
+        # Network and server errors say nothing about the client
+        self.circuit_breaker.record_neutral("primary")
+        Logger.log_error(error, f"YOUTUBE_EXTRACT: {url}")
+        return None
     
     def _try_fallback_extraction(self, url: str, download: bool = True) -> Optional[Dict[str, Any]]:
-        """Try alternative extraction methods when bot detection is triggered."""
-        try:
-            # Create a new YDL instance with different options
-            fallback_opts = BotConfig.YDL_OPTS.copy()
-            
-            # Use more flexible format selection for fallback
-            fallback_opts["format"] = "worst[height<=360]/worstaudio/worst"
-            
-            # Use Android client as primary
-            fallback_opts["extractor_args"] = {
-                "youtube": {
-                    "player_client": ["android", "web_creator", "tv_embedded"],
-                    "player_skip": ["webpage"],
-                }
-            }
-            
-            # Add more delays
-            fallback_opts["sleep_interval"] = 1
-            fallback_opts["sleep_interval_requests"] = 0.5
+        """
+        Try alternative extraction profiles when bot detection is triggered.
+        
+        Profiles whose circuit is open are skipped, and a video found to be
+        unavailable ends the attempt instead of being retried with the next
+        profile.
+        """
+        for profile in ("fallback", "basic"):
+            if not self.circuit_breaker.allow(profile):
+                Logger.log_info(f"Skipping '{profile}' profile, circuit open: {url}", "YOUTUBE")
+                continue
             
-            with yt_dlp.YoutubeDL(fallback_opts) as fallback_ydl:
-                Logger.log_info(f"Fallback extraction attempt: {url}", "YOUTUBE")
-                result = fallback_ydl.extract_info(url, download=download)
+            try:
+                Logger.log_info(f"Fallback extraction attempt ({profile}): {url}", "YOUTUBE")
+                with self.ydl_pool.acquire(profile) as ydl:
+                    result = ydl.extract_info(url, download=download)
+                self.circuit_breaker.record_success(profile)
                 if result:
-                    Logger.log_info(f"Fallback successful: {result.get('title', 'Unknown')}", "YOUTUBE")
+                    Logger.log_info(f"Fallback successful ({profile}): {result.get('title', 'Unknown')}", "YOUTUBE")
                 return result
+            except Exception as e:
+                kind = self._classify_error(e)
+                if kind == "bot_detection":
+                    self.circuit_breaker.record_failure(profile)
+                    Logger.log_warning(f"Bot detection in '{profile}' profile: {url}", "YOUTUBE")
+                    continue
                 
-        except Exception as e:
-            Logger.log_error(e, f"YOUTUBE_FALLBACK: {url}")
+                if kind == "unavailable":
+                    self.circuit_breaker.record_success(profile)
+                    self.negative_cache.add(self.get_video_id(url), str(e).splitlines()[0][:200])
+                    Logger.log_warning(f"Video unavailable: {url}", "YOUTUBE")
+                    return None
+                
+                self.circuit_breaker.record_neutral(profile)
+                Logger.log_error(e, f"YOUTUBE_FALLBACK_{profile.upper()}: {url}")
+        
+        Logger.log_warning(f"All extraction profiles failed: {url}", "YOUTUBE")
+        return None
+    
+    def _run_query(
+        self,
+        context: str,
+        query: Callable[[Any], Any],
+        dead_key: Optional[str] = None
+    ) -> Any:
+        """
+        Run a metadata query (search, playlist enumeration) with circuit breaking.
+        
+        query gets a checked-out YoutubeDL instance. Profiles are tried in
+        order like extractions are: an open circuit or bot detection moves
+        on to the next one, outcomes are recorded per profile, and a
+        permanently unavailable dead_key goes to the negative cache.
+        
+        Returns:
+            Query result or None if every profile failed
+        """
+        for profile in ("primary", "fallback", "basic"):
+            if not self.circuit_breaker.allow(profile):
+                Logger.log_info(f"Skipping '{profile}' profile, circuit open: {context}", "YOUTUBE")
+                continue
             
-            # Try one more time with the most basic format
             try:
-                basic_opts = {
-                    "format": "worst",
-                    "outtmpl": BotConfig.YDL_OPTS["outtmpl"],
-                    "quiet": True,
-                    "extractor_args": {
-                        "youtube": {
-                            "player_client": ["android"],
-                        }
-                    }
-                }
+                with self.ydl_pool.acquire(profile) as ydl:
+                    result = query(ydl)
+                self.circuit_breaker.record_success(profile)
+                return result
+            except Exception as e:
+                kind = self._classify_error(e)
+                if kind == "bot_detection":
+                    self.circuit_breaker.record_failure(profile)
+                    Logger.log_warning(f"Bot detection in '{profile}' profile: {context}", "YOUTUBE")
+                    continue
                 
-                with yt_dlp.YoutubeDL(basic_opts) as basic_ydl:
-                    Logger.log_info(f"Basic fallback attempt: {url}", "YOUTUBE")
-                    result = basic_ydl.extract_info(url, download=download)
-                    if result:
-                        Logger.log_info(f"Basic fallback successful: {result.get('title', 'Unknown')}", "YOUTUBE")
-                    return result
-            except Exception as final_e:
-                Logger.log_error(final_e, f"YOUTUBE_BASIC_FALLBACK: {url}")
+                if kind == "unavailable":
+                    self.circuit_breaker.record_success(profile)
+                    self.negative_cache.add(dead_key, str(e).splitlines()[0][:200])
+                    Logger.log_warning(f"Content unavailable: {context}", "YOUTUBE")
+                    return None
+                
+                self.circuit_breaker.record_neutral(profile)
+                Logger.log_error(e, context)
                 return None
+        
+        Logger.log_warning(f"All extraction profiles failed: {context}", "YOUTUBE")
+        return None
+    
+    @staticmethod
+    def _build_profile_opts() -> Dict[str, Dict[str, Any]]:
+        """Build yt-dlp options of every extraction profile (fixed player client set each)."""
+        primary_opts = BotConfig.YDL_OPTS.copy()
+        
+        # Add file size limit if configured
+        if hasattr(BotConfig, 'MAX_DOWNLOAD_SIZE') and BotConfig.MAX_DOWNLOAD_SIZE:
+            primary_opts["max_filesize"] = BotConfig.MAX_DOWNLOAD_SIZE
+        
+        fallback_opts = BotConfig.YDL_OPTS.copy()
+        # Use more flexible format selection for fallback
+        fallback_opts["format"] = "worst[height<=360]/worstaudio/worst"
+        # Use Android client as primary
+        fallback_opts["extractor_args"] = {
+            "youtube": {
+                "player_client": ["android", "web_creator", "tv_embedded"],
+                "player_skip": ["webpage"],
+            }
+        }
+        # Add more delays
+        fallback_opts["sleep_interval"] = 1
+        fallback_opts["sleep_interval_requests"] = 0.5
+        
+        # Most basic format as the last resort
+        basic_opts = {
+            "format": "worst",
+            "outtmpl": BotConfig.YDL_OPTS["outtmpl"],
+            "paths": BotConfig.YDL_OPTS["paths"],
+            "quiet": True,
+            "extractor_args": {
+                "youtube": {
+                    "player_client": ["android"],
+                }
+            }
+        }
+        
+        return {"primary": primary_opts, "fallback": fallback_opts, "basic": basic_opts}
     
     def search_youtube(self, query: str, max_results: int = 1) -> Optional[List[Dict[str, Any]]]:
         """
-        Search YouTube and return results.
+        Search YouTube and return flat results (no per-video extraction).
         Uses caching to avoid repeated API calls.
         """
-        cache_key = f"{query}:{max_results}"
+        cache_key = f"{self.normalize_query(query)}:{max_results}"
         
         # Check cache
-        if cache_key in self.search_cache:
-            cache_time, cache_data = self.search_cache[cache_key]
-            if time.time() - cache_time < self.cache_expiry:
-                return cache_data
+        cache_data = self.search_cache.get(cache_key)
+        if cache_data is not None:
+            return self._live_entries(cache_data)
         
         # Perform search
-        try:
-            search_query = f"ytsearch{max_results if max_results > 1 else ''}:'{query}'"
-            result = self.ydl.extract_info(search_query, download=False)
-            
-            if result and 'entries' in result:
-                entries = result['entries']
-                # Cache the result
-                self.search_cache[cache_key] = (time.time(), entries)
-                return entries
-            
-        except Exception as e:
-            Logger.log_error(e, f"YOUTUBE_SEARCH: {query}")
+        def search(ydl: Any) -> Optional[List[Dict[str, Any]]]:
+            result = ydl.extract_info(self._search_query(query, max_results), download=False, process=False)
+            return list(result.get('entries') or []) if result else None
         
-        return None
+        entries = self._run_query(f"YOUTUBE_SEARCH: {query}", search)
+        if entries is None:
+            return None
+        
+        # Cache the result
+        return self._live_entries(self.search_cache.put(cache_key, entries))
     
-    def get_track_info(self, url_or_query: str) -> Optional[Dict[str, Any]]:
+    def get_track_info(self, url_or_query: str, download: bool = True) -> Optional[Dict[str, Any]]:
         """
         Get track info from URL or search query.
         Returns single track info or None if failed.
+        
+        Runs as a single pass: the resolve stage (extractor or search) yields
+        an unprocessed info dict which the fetch stage finishes in place, so
+        each video page is extracted only once. With download=False only
+        metadata and the media stream URL are resolved, which is all
+        streaming playback needs.
         """
+        timings: Dict[str, float] = {}
         try:
             if self.is_youtube_link(url_or_query):
-                # First get info without downloading for metadata
-                result = self.extract_info(url_or_query, download=False)
-                if result and not result.get('_type') == 'playlist':
-                    # Then download the file
-                    self.extract_info(url_or_query, download=True)
-                    return result
-                return result
+                with self._stage("resolve", timings):
+                    ie_result = self.extract_info(url_or_query, download=False, process=False)
+                if not ie_result:
+                    return None
+                
+                # Channel, @handle or list URLs resolve to many videos; processing
+                # them here would fetch every entry inside one extraction job
+                if ie_result.get('_type') in ('playlist', 'multi_video'):
+                    Logger.log_warning(f"Link resolves to a playlist, not a single track: {url_or_query}", "YOUTUBE")
+                    return None
             else:
-                # Search and return first result
-                results = self.search_youtube(url_or_query, 1)
-                if results and len(results) > 0:
-                    # Download the found track
-                    track_info = results[0]
-                    if track_info and 'id' in track_info:
-                        # Download the actual file
-                        self.extract_info(f"https://www.youtube.com/watch?v={track_info['id']}", download=True)
-                    return track_info
-                return None
+                with self._stage("search", timings):
+                    ie_result = self._search_first_entry(url_or_query)
+                if not ie_result:
+                    return None
+            
+            # Cached audio only needs metadata, skip the download
+            if download and ie_result.get('id') and self.audio_cache.contains(ie_result['id']):
+                download = False
+            
+            with self._stage("fetch" if download else "metadata", timings):
+                result = self.process_result(ie_result, download=download)
+            
+            Logger.log_info(
+                "Stage timings: " + ", ".join(f"{name}={value:.2f}s" for name, value in timings.items()),
+                "YOUTUBE"
+            )
+            return result
         except Exception as e:
             Logger.log_error(e, f"GET_TRACK_INFO: {url_or_query}")
             return None
     
-    def get_playlist_info(self, url: str) -> Optional[List[Dict[str, Any]]]:
-        """Get playlist information from URL."""
-        if not self.is_youtube_playlist_link(url):
+    @staticmethod
+    def _search_query(query: str, max_results: int = 1) -> str:
+        """Build yt-dlp search URL, the same for every search path."""
+        return f"ytsearch{max_results if max_results > 1 else ''}:'{query}'"
+    
+    def _live_entries(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop search results known to be unavailable."""
+        return [entry for entry in entries if self.negative_cache.get(entry.get('id')) is None]
+    
+    def _search_first_entry(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Find first search hit as a lazy url result, without extracting the video.
+        Uses caching to avoid repeated searches.
+        """
+        cache_key = f"{self.normalize_query(query)}:first"
+        
+        cache_data = self.search_cache.get(cache_key)
+        if cache_data is not None:
+            return dict(cache_data)
+        
+        def search(ydl: Any) -> List[Dict[str, Any]]:
+            result = ydl.extract_info(self._search_query(query), download=False, process=False)
+            return list(result.get('entries') or []) if result else []
+        
+        entries = self._run_query(f"YOUTUBE_SEARCH: {query}", search)
+        if not entries:
             return None
         
+        # Hand out a copy, processing mutates the dict
+        return dict(self.search_cache.put(cache_key, entries[0]))
+    
+    @contextmanager
+    def _stage(self, name: str, timings: Dict[str, float]) -> Iterator[None]:
+        """Time one pipeline stage and record it for statistics."""
+        started = time.perf_counter()
         try:
-            result = self.extract_info(url, download=False)
-            if result and 'entries' in result:
-                return result['entries']
-        except Exception as e:
-            Logger.log_error(e, f"PLAYLIST_EXTRACT: {url}")
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            timings[name] = elapsed
+            STAGE_SECONDS.observe(elapsed, stage=name)
+            with self._timings_lock:
+                self.stage_timings.setdefault(name, deque(maxlen=100)).append(elapsed)
+    
+    def get_stage_stats(self) -> Dict[str, str]:
+        """Get average duration of recent pipeline stages."""
+        with self._timings_lock:
+            return {
+                name: f"{sum(values) / len(values):.2f}s (n={len(values)})"
+                for name, values in self.stage_timings.items() if values
+            }
+    
+    @staticmethod
+    def get_stream_url(info: Dict[str, Any]) -> Optional[str]:
+        """
+        Get playable media URL from a resolved (non-flat) info dict.
+        
+        Returns:
+            Direct audio URL or None if info was not format-resolved
+        """
+        if not info:
+            return None
+        
+        # Merged formats (audio+video) - pick the audio part
+        for fmt in info.get('requested_formats') or []:
+            if fmt.get('vcodec') in (None, 'none') and fmt.get('url'):
+                return fmt['url']
+        
+        # Flat/url results carry a page URL, not a media URL
+        if info.get('format_id') and info.get('url'):
+            return info['url']
         
         return None
     
-    def clear_expired_cache(self) -> int:
-        """Clear expired cache entries and return count of removed items."""
-        current_time = time.time()
-        expired_keys = []
+    @staticmethod
+    def get_audio_codec(info: Dict[str, Any]) -> Optional[str]:
+        """
+        Get audio codec of the selected format, e.g. "opus" or "mp4a.40.2".
+        
+        Returns:
+            Codec name or None if unknown
+        """
+        if not info:
+            return None
+        
+        for fmt in info.get('requested_formats') or []:
+            if fmt.get('vcodec') in (None, 'none') and fmt.get('acodec') not in (None, 'none'):
+                return fmt['acodec']
         
-        for key, (cache_time, _) in self.search_cache.items():
-            if current_time - cache_time > self.cache_expiry:
-                expired_keys.append(key)
+        acodec = info.get('acodec')
+        return acodec if acodec not in (None, 'none') else None
+    
+    def resolve_stream(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resolve fresh media URL for a video without downloading it.
+        
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (stream_url, audio_codec)
+        """
+        info = self.extract_info(url, download=False)
+        return self.get_stream_url(info), self.get_audio_codec(info)
+    
+    def get_playlist_entries(self, url: str, limit: int) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """
+        Enumerate first entries of a playlist without resolving the videos.
+        
+        yt-dlp fetches playlist pages lazily while entries are consumed, so
+        only the pages covering the first `limit` entries are requested.
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[int]]: (flat entries, playlist size if known)
+            or None if the playlist could not be read
+        """
+        if not self.is_youtube_playlist_link(url):
+            return None
         
-        for key in expired_keys:
-            del self.search_cache[key]
+        playlist_id = self.get_playlist_id(url)
+        if self._is_known_dead(playlist_id, url):
+            return None
         
-        return len(expired_keys)
+        def enumerate_entries(ydl: Any) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+            result = ydl.extract_info(url, download=False, process=False)
+            # Playlist pages first resolve to a url result pointing at the tab extractor
+            while result and result.get('_type') in ('url', 'url_transparent'):
+                result = ydl.extract_info(
+                    result['url'], ie_key=result.get('ie_key'), download=False, process=False
+                )
+            if not result or 'entries' not in result:
+                return None
+            
+            # Consume the page generator while holding the instance it belongs to
+            entries = []
+            for entry in result['entries']:
+                if len(entries) >= limit:
+                    break
+                if entry and entry.get('id'):
+                    entries.append(SearchCache.slim(entry))
+            return entries, result.get('playlist_count')
+        
+        found = self._run_query(f"PLAYLIST_EXTRACT: {url}", enumerate_entries, playlist_id)
+        if found is not None:
+            Logger.log_info(f"Enumerated {len(found[0])} playlist entries: {url}", "YOUTUBE")
+        return found
+    
+    def clear_expired_cache(self) -> int:
+        """Clear expired cache entries and return count of removed items."""
+        return self.search_cache.expire()
     
     def get_similar_tracks(self, track_info: Dict[str, Any], count: int = 3) -> List[Dict[str, Any]]:
         """Get tracks similar to the provided track."""
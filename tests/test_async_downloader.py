@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+import pytest
+from config import BotConfig
+from utils.audio_cache import AudioCache
+from music.youtube_downloader import YouTubeDownloader
+from music.async_downloader import AsyncYouTubeDownloader
+
+VIDEO_ID = "dQw4w9WgXcQ"
+URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+class FakeYDL:
+    """Extractor answering every link or search with VIDEO_ID; downloads are slow."""
+
+    def __init__(self, files_dir):
+        self.files_dir = files_dir
+        self.downloads = 0
+        self._lock = threading.Lock()
+
+    def extract_info(self, url, download=True, process=True):
+        if url.startswith("ytsearch"):
+            return {"_type": "playlist", "entries": [{"_type": "url", "id": VIDEO_ID, "url": URL}]}
+        if not process:
+            return {"id": VIDEO_ID, "webpage_url": URL, "title": "Song"}
+        return self._finish(download)
+
+    def process_ie_result(self, ie_result, download=True):
+        return self._finish(download)
+
+    def _finish(self, download):
+        info = {"id": VIDEO_ID, "webpage_url": URL, "title": "Song"}
+        if download:
+            with self._lock:
+                self.downloads += 1
+            time.sleep(0.1)
+            path = self.files_dir / f"{VIDEO_ID}.webm"
+            path.write_bytes(b"audio")
+            info["requested_downloads"] = [{"filepath": str(path), "acodec": "opus"}]
+        return info
+
+class FakePool:
+    def __init__(self, ydl):
+        self.ydl = ydl
+
+    @contextmanager
+    def acquire(self, profile):
+        yield self.ydl
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    monkeypatch.setattr(BotConfig, "FILES_DIR", str(tmp_path))
+    downloader = YouTubeDownloader()
+    downloader.audio_cache = AudioCache(index_path=str(tmp_path / "index.json"))
+    downloader.ydl_pool = FakePool(FakeYDL(tmp_path))
+    return downloader
+
+def test_extract_info_and_get_track_info_share_one_download(downloader):
+    async def scenario():
+        async_downloader = AsyncYouTubeDownloader(downloader, max_workers=4)
+        try:
+            return await asyncio.gather(
+                async_downloader.extract_info(URL, download=True),
+                async_downloader.get_track_info(URL, download=True),
+            )
+        finally:
+            async_downloader.shutdown()
+
+    results = asyncio.run(scenario())
+
+    assert all(result and result["id"] == VIDEO_ID for result in results)
+    assert downloader.ydl_pool.ydl.downloads == 1
+
+def test_search_and_link_of_same_video_download_once(downloader):
+    async def scenario():
+        async_downloader = AsyncYouTubeDownloader(downloader, max_workers=4)
+        try:
+            return await asyncio.gather(
+                async_downloader.extract_info(URL, download=True),
+                async_downloader.get_track_info("never gonna give you up", download=True),
+            )
+        finally:
+            async_downloader.shutdown()
+
+    results = asyncio.run(scenario())
+
+    assert all(result and result["id"] == VIDEO_ID for result in results)
+    assert downloader.ydl_pool.ydl.downloads == 1
+    assert downloader.audio_cache.contains(VIDEO_ID)
+    assert not downloader._download_slots
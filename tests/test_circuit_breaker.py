@@ -0,0 +1,107 @@
+import time
+from contextlib import contextmanager
+from music.circuit_breaker import CircuitBreaker
+from music.youtube_downloader import YouTubeDownloader
+
+COOLDOWN = 0.05
+
+def tripped_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(window=4, threshold=0.5, cooldown=COOLDOWN, min_attempts=2)
+    breaker.record_failure("primary")
+    breaker.record_failure("primary")
+    assert not breaker.allow("primary")
+    return breaker
+
+def test_inconclusive_trial_reopens_for_another_cooldown():
+    breaker = tripped_breaker()
+    time.sleep(COOLDOWN * 1.5)
+    assert breaker.allow("primary")  # half-open trial
+
+    breaker.record_neutral("primary")
+    assert not breaker.allow("primary")
+
+    time.sleep(COOLDOWN * 1.5)
+    assert breaker.allow("primary")
+
+def test_unclassified_extraction_error_does_not_wedge_half_open_circuit():
+    downloader = YouTubeDownloader()
+    downloader.circuit_breaker = tripped_breaker()
+    time.sleep(COOLDOWN * 1.5)
+    assert downloader.circuit_breaker.allow("primary")
+
+    error = Exception("HTTP Error 503: Service Unavailable")
+    assert downloader._handle_extraction_error(error, "https://youtu.be/aaaaaaaaaaa", "aaaaaaaaaaa", False) is None
+    assert downloader.negative_cache.get("aaaaaaaaaaa") is None
+
+    time.sleep(COOLDOWN * 1.5)
+    assert downloader.circuit_breaker.allow("primary")
+
+def test_neutral_outcome_outside_trial_changes_nothing():
+    breaker = CircuitBreaker(window=4, threshold=0.5, cooldown=COOLDOWN, min_attempts=2)
+    breaker.record_neutral("primary")
+    assert breaker.allow("primary")
+    assert "primary" not in breaker.outcomes
+
+class ProfilePool:
+    """Pool handing out one scripted extractor per profile, recording which were used."""
+
+    def __init__(self, **answers):
+        self.answers = answers
+        self.used = []
+
+    @contextmanager
+    def acquire(self, profile):
+        self.used.append(profile)
+        yield ScriptedYDL(self.answers[profile])
+
+class ScriptedYDL:
+    def __init__(self, answer):
+        self.answer = answer
+
+    def extract_info(self, url, download=True, process=True, ie_key=None):
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+SEARCH_RESULT = {"_type": "playlist", "entries": [
+    {"_type": "url", "id": "aaaaaaaaaaa", "url": "https://www.youtube.com/watch?v=aaaaaaaaaaa"},
+    {"_type": "url", "id": "bbbbbbbbbbb", "url": "https://www.youtube.com/watch?v=bbbbbbbbbbb"},
+]}
+BOT_CHECK = Exception("Sign in to confirm you're not a bot")
+
+def make_downloader(**answers) -> YouTubeDownloader:
+    downloader = YouTubeDownloader()
+    downloader.search_cache.entries.clear()
+    downloader.ydl_pool = ProfilePool(**answers)
+    return downloader
+
+def test_search_skips_primary_profile_while_its_circuit_is_open():
+    downloader = make_downloader(primary=SEARCH_RESULT, fallback=SEARCH_RESULT)
+    downloader.circuit_breaker = tripped_breaker()
+
+    assert len(downloader.search_youtube("circuit open query", 2)) == 2
+    assert downloader.ydl_pool.used == ["fallback"]
+
+def test_bot_detection_in_search_trips_breaker_and_falls_back():
+    downloader = make_downloader(primary=BOT_CHECK, fallback=SEARCH_RESULT)
+    downloader.circuit_breaker = CircuitBreaker(window=4, threshold=0.5, cooldown=60, min_attempts=1)
+
+    assert downloader._search_first_entry("bot check query")["id"] == "aaaaaaaaaaa"
+    assert downloader.ydl_pool.used == ["primary", "fallback"]
+    assert not downloader.circuit_breaker.allow("primary")
+
+def test_search_results_drop_known_unavailable_videos():
+    downloader = make_downloader(primary=SEARCH_RESULT)
+    downloader.negative_cache.add("aaaaaaaaaaa", "Private video")
+
+    results = downloader.search_youtube("negative cache query", 2)
+
+    assert [entry["id"] for entry in results] == ["bbbbbbbbbbb"]
+
+def test_unavailable_playlist_is_not_enumerated_again():
+    url = "https://www.youtube.com/playlist?list=PLdeadplaylist"
+    downloader = make_downloader(primary=Exception("ERROR: [youtube:tab] The playlist does not exist."))
+
+    assert downloader.get_playlist_entries(url, 10) is None
+    assert downloader.get_playlist_entries(url, 10) is None
+    assert downloader.ydl_pool.used == ["primary"]
@@ -0,0 +1,27 @@
+from music.track import Track
+from music.track_queue import TrackQueue
+
+def make_track(number: int, user_id: int) -> Track:
+    return Track(
+        url=f"https://www.youtube.com/watch?v={number:011d}",
+        title=f"Track {number}",
+        uploader="Uploader",
+        duration=180,
+        id=f"{number:011d}",
+        user=f"user{user_id}",
+        user_id=user_id
+    )
+
+def test_remove_user_returns_tracks_in_queue_order():
+    tracks = [make_track(number, number % 2) for number in range(8)]
+    queue = TrackQueue(tracks[:6])
+    queue.appendleft(tracks[6])
+    queue.append(tracks[7])
+    queue.move(5, 1)
+    queue.move(0, 4)
+
+    expected = [track for track in queue if track.user_id == 0]
+    removed = queue.remove_user(0)
+
+    assert removed == expected
+    assert [track.user_id for track in queue] == [1] * len(queue)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple
+from config import BotConfig
+from utils.logger import Logger
+from utils.metrics import REGISTRY
+
+CACHE_LOOKUPS = REGISTRY.counter("musicbot_cache_lookups_total", "Cache lookups", ("cache", "result"))
+
+class AudioCache:
+    """
+    Persistent on-disk audio cache indexed by video ID with quota-bound eviction.
+
+    Videos that are queued or playing are pinned and never evicted. Unpinned
+    entries sit in a heap ordered by eviction rank (last access for LRU,
+    hit count then last access for LFU); rank changes push a new heap item
+    and outdated items are skipped when popped, so neither eviction nor
+    pinning has to scan the index.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        policy: Optional[str] = None,
+        index_path: Optional[str] = None
+    ):
+        self.max_bytes = max_bytes if max_bytes is not None else BotConfig.AUDIO_CACHE_MAX_BYTES
+        self.policy = policy or BotConfig.AUDIO_CACHE_POLICY
+        self.index_path = index_path or BotConfig.AUDIO_CACHE_INDEX
+
+        # video_id -> {"file", "size", "last_access", "hits", "codec"}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.total_bytes = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self.pinned: Set[str] = set()
+        # (rank, video_id) eviction candidates, may contain outdated items
+        self._heap: List[Tuple[Tuple[float, ...], str]] = []
+        self._dirty = False
+        # Recently streamed video IDs, oldest first
+        self.streamed: "OrderedDict[str, None]" = OrderedDict()
+        # Downloads are registered from extraction worker threads
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def lookup(self, video_id: str) -> Optional[str]:
+        """
+        Get cached file path for video and record the access.
+
+        Returns:
+            File path or None on cache miss
+        """
+        with self._lock:
+            entry = self.entries.get(video_id)
+            if entry and not os.path.exists(self._path(entry)):
+                # File removed behind our back
+                self._drop(video_id)
+                entry = None
+
+            if entry is None:
+                self.stats["misses"] += 1
+                CACHE_LOOKUPS.inc(cache="audio", result="miss")
+                return None
+
+            entry["last_access"] = time.time()
+            entry["hits"] += 1
+            self.stats["hits"] += 1
+            CACHE_LOOKUPS.inc(cache="audio", result="hit")
+            self._dirty = True
+            self._push(video_id)
+            return self._path(entry)
+
+    def contains(self, video_id: str) -> bool:
+        """Check if video is cached without counting it as an access."""
+        with self._lock:
+            entry = self.entries.get(video_id)
+            return entry is not None and os.path.exists(self._path(entry))
+
+    def register(self, video_id: str, file_path: str, codec: Optional[str] = None) -> None:
+        """Add freshly downloaded file to the index."""
+        try:
+            size = os.path.getsize(file_path)
+        except OSError as e:
+            Logger.log_error(e, f"AUDIO_CACHE_REGISTER: {file_path}")
+            return
+
+        with self._lock:
+            self._drop(video_id)
+            self.entries[video_id] = {
+                "file": os.path.basename(file_path),
+                "size": size,
+                "last_access": time.time(),
+                "hits": 0,
+                "codec": codec,
+            }
+            self.total_bytes += size
+            self._dirty = True
+            self._push(video_id)
+
+        self.enforce_quota()
+
+    def note_stream(self, video_id: str) -> bool:
+        """
+        Remember that video was streamed instead of played from the cache.
+
+        Returns:
+            True if it was already streamed recently, i.e. it is worth caching
+        """
+        with self._lock:
+            repeat = video_id in self.streamed
+            self.streamed[video_id] = None
+            self.streamed.move_to_end(video_id)
+            while len(self.streamed) > BotConfig.AUDIO_CACHE_STREAM_HISTORY:
+                self.streamed.popitem(last=False)
+            return repeat
+
+    def get_codec(self, video_id: str) -> Optional[str]:
+        """Get audio codec of cached file, if known."""
+        with self._lock:
+            entry = self.entries.get(video_id)
+            return entry.get("codec") if entry else None
+
+    def pin(self, video_id: str) -> None:
+        """Protect video from eviction while it is queued or playing."""
+        with self._lock:
+            self.pinned.add(video_id)
+
+    def release(self, video_id: str) -> None:
+        """Make video evictable again and trim the cache if it is over quota."""
+        with self._lock:
+            self.pinned.discard(video_id)
+            self._push(video_id)
+
+        self.enforce_quota()
+
+    def enforce_quota(self) -> int:
+        """
+        Evict unpinned entries in rank order until the cache fits its byte quota.
+
+        Returns:
+            Number of evicted files
+        """
+        evicted = 0
+        with self._lock:
+            while self.total_bytes > self.max_bytes and self._heap:
+                rank, video_id = heapq.heappop(self._heap)
+                entry = self.entries.get(video_id)
+                if entry is None or video_id in self.pinned or rank != self._rank(entry):
+                    # Outdated heap item
+                    continue
+
+                file_path = self._path(entry)
+                try:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                except OSError as e:
+                    Logger.log_error(e, f"AUDIO_CACHE_EVICT: {file_path}")
+                    continue
+                self._drop(video_id)
+                evicted += 1
+
+            self.stats["evictions"] += evicted
+
+        if evicted:
+            Logger.log_info(f"Evicted {evicted} cached audio files", "AUDIO_CACHE")
+            self.save()
+        return evicted
+
+    def save(self) -> None:
+        """Persist index atomically if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self.entries, separators=(",", ":"))
+            self._dirty = False
+
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            Logger.log_error(e, "AUDIO_CACHE_SAVE")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            hit_rate = self.stats["hits"] / lookups * 100 if lookups else 0.0
+            return {
+                "files": len(self.entries),
+                "pinned": len(self.pinned),
+                "used": f"{self.total_bytes / 1024 ** 2:.1f} / {self.max_bytes / 1024 ** 2:.0f} MiB",
+                "hit_rate": f"{hit_rate:.1f}%",
+                **self.stats,
+            }
+
+    def _path(self, entry: Dict[str, Any]) -> str:
+        """Get full path of cached file."""
+        return f"{BotConfig.FILES_DIR}/{entry['file']}"
+
+    def _rank(self, entry: Dict[str, Any]) -> Tuple[float, ...]:
+        """Get eviction rank of entry, lowest is evicted first."""
+        if self.policy == "lfu":
+            return (entry["hits"], entry["last_access"])
+        return (entry["last_access"],)
+
+    def _push(self, video_id: str) -> None:
+        """Queue entry for eviction at its current rank (caller holds the lock)."""
+        entry = self.entries.get(video_id)
+        if entry is None or video_id in self.pinned:
+            return
+        heapq.heappush(self._heap, (self._rank(entry), video_id))
+
+        # Outdated items pile up as entries are accessed, rebuild now and then
+        if len(self._heap) > 2 * len(self.entries) + 64:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        """Rebuild eviction heap from unpinned entries (caller holds the lock)."""
+        self._heap = [
+            (self._rank(entry), video_id)
+            for video_id, entry in self.entries.items() if video_id not in self.pinned
+        ]
+        heapq.heapify(self._heap)
+
+    def _drop(self, video_id: str) -> None:
+        """Remove entry from the index (caller holds the lock)."""
+        entry = self.entries.pop(video_id, None)
+        if entry:
+            self.total_bytes -= entry["size"]
+            self._dirty = True
+
+    def _load(self) -> None:
+        """Load index from disk, adopting untracked audio files on first run."""
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            elif os.path.exists(BotConfig.FILES_DIR):
+                now = time.time()
+                for file in os.listdir(BotConfig.FILES_DIR):
+                    if any(file.endswith(ext) for ext in BotConfig.AUDIO_EXTENSIONS):
+                        self.entries[file.split(".")[0]] = {
+                            "file": file,
+                            "size": os.path.getsize(f"{BotConfig.FILES_DIR}/{file}"),
+                            "last_access": now,
+                            "hits": 0,
+                        }
+                self._dirty = bool(self.entries)
+        except Exception as e:
+            Logger.log_error(e, "AUDIO_CACHE_LOAD")
+            self.entries = {}
+
+        self.total_bytes = sum(entry["size"] for entry in self.entries.values())
+        self._rebuild_heap()
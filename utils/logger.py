@@ -37,6 +37,11 @@ class Logger:
         
         print(log_msg)
     
+    @staticmethod
+    def log_warning(message: str, context: Optional[str] = None) -> None:
+        """Log warning message to console."""
+        Logger.log_info(f"WARNING: {message}", context)
+    
     @staticmethod
     def log_cache_cleanup(items_removed: int) -> None:
         """Log cache cleanup operations."""
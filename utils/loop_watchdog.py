@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+from config import BotConfig
+from utils.logger import Logger
+from utils.metrics import REGISTRY
+
+LOOP_LAG = REGISTRY.histogram(
+    "musicbot_event_loop_lag_seconds", "How late the event loop ran the watchdog heartbeat",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+LOOP_BLOCKS = REGISTRY.counter(
+    "musicbot_event_loop_blocks_total", "Event loop stalls longer than the threshold", ("site",)
+)
+
+# Frames from these files say nothing about who blocked the loop
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IGNORED = (os.path.abspath(__file__),)
+
+Site = Tuple[str, int, str]
+
+def _describe(filename: str, lineno: int, function: str) -> str:
+    """Short "path:line function" label, relative to the project when possible."""
+    if filename.startswith(_PROJECT_ROOT):
+        filename = os.path.relpath(filename, _PROJECT_ROOT)
+    return f"{filename}:{lineno} {function}"
+
+class LoopWatchdog:
+    """
+    Detects event loop stalls and attributes them to the blocking call site.
+
+    A heartbeat task on the loop wakes up every `interval` seconds and
+    records how late it ran. A daemon thread watches the heartbeat; once it
+    is more than `threshold` seconds overdue, the thread grabs the loop
+    thread's current stack with sys._current_frames(). The innermost frame
+    inside this project (e.g. a PlaylistManager query or a synchronous
+    yt-dlp call in a cog) is the call site the stall is charged to.
+
+    Stalls caused by C code that holds the GIL are only seen once it is
+    released, so their stack may already show the code that ran next.
+    """
+
+    def __init__(self, interval: Optional[float] = None, threshold: Optional[float] = None):
+        self.interval = interval or BotConfig.LOOP_WATCHDOG_INTERVAL
+        self.threshold = threshold or BotConfig.LOOP_BLOCK_THRESHOLD
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_beat = time.monotonic()
+
+        # call site -> {"count", "total", "max", "stack"}
+        self.sites: Dict[Site, Dict[str, Any]] = {}
+        self.stats: Dict[str, float] = {"stalls": 0, "max_lag": 0.0}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start watching the running event loop."""
+        if self._heartbeat is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        # Fresh event, a thread from an earlier start() must not miss its stop
+        self._stop = threading.Event()
+        self._heartbeat = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, args=(self._stop,), name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop heartbeat and watchdog thread."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._thread = None
+
+    def get_stats(self, limit: int = 5) -> Dict[str, Any]:
+        """Get stall counters and the call sites that blocked the loop the longest."""
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "stalls": int(self.stats["stalls"]),
+                "max_lag": f"{self.stats['max_lag'] * 1000:.0f} ms",
+            }
+            ranked = sorted(self.sites.items(), key=lambda item: item[1]["total"], reverse=True)
+            for key, site in ranked[:limit]:
+                stats[_describe(*key)] = (
+                    f"{site['count']}×, max {site['max'] * 1000:.0f} ms, razem {site['total']:.2f}s"
+                )
+            return stats
+
+    async def _beat(self) -> None:
+        """Heartbeat: the later it wakes up, the longer the loop was busy."""
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(0.0, now - started - self.interval)
+            LOOP_LAG.observe(lag)
+            if lag > self.stats["max_lag"]:
+                self.stats["max_lag"] = lag
+
+    def _watch(self, stop: threading.Event) -> None:
+        """Watchdog thread: capture the loop's stack while the heartbeat is overdue."""
+        check = min(self.interval, self.threshold) / 2
+        stalled_beat: Optional[float] = None
+        site: Optional[Site] = None
+        stack: List[str] = []
+
+        while not stop.wait(check):
+            last_beat = self._last_beat
+            if stalled_beat is None:
+                if time.monotonic() - last_beat >= self.interval + self.threshold:
+                    stalled_beat = last_beat
+                    site, stack = self._capture()
+            elif last_beat != stalled_beat:
+                # Heartbeat ran again: the stall is over
+                self._record(site, stack, last_beat - stalled_beat - self.interval)
+                stalled_beat = None
+
+    def _capture(self) -> Tuple[Site, List[str]]:
+        """Get blamed call site and a short stack of the loop thread."""
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return ("<unknown>", 0, "<unknown>"), []
+
+        frames = [entry for entry in traceback.extract_stack(frame) if entry.filename not in _IGNORED]
+        own = [
+            entry for entry in frames
+            if entry.filename.startswith(_PROJECT_ROOT) and "site-packages" not in entry.filename
+        ]
+        blamed = (own or frames)[-1]
+        stack = [_describe(entry.filename, entry.lineno, entry.name) for entry in (own or frames)[-6:]]
+        return (blamed.filename, blamed.lineno, blamed.name), stack
+
+    def _record(self, site: Site, stack: List[str], duration: float) -> None:
+        """Aggregate finished stall and report it."""
+        with self._lock:
+            entry = self.sites.setdefault(site, {"count": 0, "total": 0.0, "max": 0.0, "stack": stack})
+            entry["count"] += 1
+            entry["total"] += duration
+            entry["max"] = max(entry["max"], duration)
+            entry["stack"] = stack
+            self.stats["stalls"] += 1
+
+        label = _describe(*site)
+        LOOP_BLOCKS.inc(site=label)
+        Logger.log_warning(
+            f"Event loop blocked for {duration * 1000:.0f} ms at {label}\n    " + "\n    ".join(stack),
+            "LOOP_WATCHDOG"
+        )
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import time
+import pstats
+import asyncio
+import cProfile
+import marshal
+import tracemalloc
+from typing import Awaitable, Callable, Dict, Optional
+from config import BotConfig
+
+# file name -> content, uploaded as attachments
+Report = Dict[str, bytes]
+OnExpire = Callable[[], Awaitable[None]]
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _stamp() -> str:
+    return time.strftime("%Y%m%d-%H%M%S")
+
+def _relative(filename: str) -> str:
+    """Path relative to the project when the file belongs to it."""
+    if filename.startswith(_PROJECT_ROOT):
+        return os.path.relpath(filename, _PROJECT_ROOT)
+    return filename
+
+class _BoundedSession:
+    """
+    Diagnostic session that ends by itself after a bounded time.
+
+    Nothing is hooked into the interpreter until start(), and stop()
+    removes the hook again, so an idle session costs nothing.
+    """
+
+    def __init__(self) -> None:
+        self.started = 0.0
+        self.seconds = 0.0
+        self._timer: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._timer is not None
+
+    def remaining(self) -> float:
+        return max(0.0, self.started + self.seconds - time.monotonic())
+
+    def _arm(self, seconds: float, on_expire: OnExpire) -> None:
+        """Schedule on_expire (which is expected to call stop()) after `seconds`."""
+        self.started = time.monotonic()
+        self.seconds = seconds
+        self._timer = asyncio.create_task(self._expire(seconds, on_expire))
+
+    def _disarm(self) -> float:
+        """Cancel the timer unless it is the caller; get session length."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        return time.monotonic() - self.started
+
+    @staticmethod
+    async def _expire(seconds: float, on_expire: OnExpire) -> None:
+        await asyncio.sleep(seconds)
+        await on_expire()
+
+class CpuProfiler(_BoundedSession):
+    """
+    cProfile session of the event loop thread.
+
+    cProfile only sees the thread that enabled it, which is the loop thread
+    running the cogs; extraction workers and voice players are not included.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.profile: Optional[cProfile.Profile] = None
+
+    def start(self, seconds: float, on_expire: OnExpire) -> None:
+        """Start profiling. Raises ValueError when another profiler is active."""
+        profile = cProfile.Profile()
+        profile.enable()
+        self.profile = profile
+        self._arm(seconds, on_expire)
+
+    def stop(self) -> Report:
+        """Stop profiling and build text report plus raw pstats dump."""
+        elapsed = self._disarm()
+        profile, self.profile = self.profile, None
+        if profile is None:
+            return {}
+        profile.disable()
+
+        stream = io.StringIO()
+        stream.write(f"cProfile of the event loop thread, {elapsed:.1f}s\n")
+        stats = pstats.Stats(profile, stream=stream)
+        for sort in (pstats.SortKey.CUMULATIVE, pstats.SortKey.TIME):
+            stream.write(f"\n===== sorted by {sort.value} =====\n")
+            stats.sort_stats(sort).print_stats(BotConfig.PROFILER_REPORT_LINES)
+
+        name = f"profile-{_stamp()}"
+        return {
+            f"{name}.txt": stream.getvalue().encode("utf-8"),
+            # Same format as Profile.dump_stats(), opens in pstats/snakeviz
+            f"{name}.prof": marshal.dumps(stats.stats),
+        }
+
+class MemoryTracer(_BoundedSession):
+    """
+    tracemalloc window: allocations made while it runs are traced, the
+    snapshot at the end lists where the memory still held was allocated.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        # tracemalloc enabled elsewhere (PYTHONTRACEMALLOC) stays enabled
+        self.started_tracing = False
+
+    def start(self, seconds: float, on_expire: OnExpire) -> None:
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start(BotConfig.PROFILER_TRACE_FRAMES)
+        self._arm(seconds, on_expire)
+
+    def stop(self) -> Report:
+        """Snapshot traced allocations, stop tracing and build text report."""
+        elapsed = self._disarm()
+        if not tracemalloc.is_tracing():
+            return {}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+        limit = BotConfig.PROFILER_REPORT_LINES
+        lines = [
+            f"tracemalloc, window {elapsed:.1f}s, traced {current / 1024 ** 2:.1f} MiB "
+            f"(peak {peak / 1024 ** 2:.1f} MiB)",
+            "",
+            f"===== top {limit} lines =====",
+        ]
+        for stat in snapshot.statistics("lineno")[:limit]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8} blocks  {_relative(frame.filename)}:{frame.lineno}")
+
+        lines += ["", "===== top 10 tracebacks ====="]
+        for stat in snapshot.statistics("traceback")[:10]:
+            lines.append(f"\n{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+            lines += stat.traceback.format(most_recent_first=True)
+
+        return {f"memory-{_stamp()}.txt": "\n".join(lines).encode("utf-8")}
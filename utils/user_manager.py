@@ -18,29 +18,6 @@ class UserManager:
         await ctx.channel.purge(limit=1)
         return ctx.message.author.display_name, ctx.message.guild.id
     
-    @staticmethod
-    def get_user_id_from_name(username: str, guild_id: int, bot: commands.Bot) -> Optional[int]:
-        """
-        Get user ID from display name in a specific guild.
-        
-        Args:
-            username: Display name to search for
-            guild_id: Guild ID to search in
-            bot: Bot instance
-            
-        Returns:
-            User ID if found, None otherwise
-        """
-        guild = bot.get_guild(guild_id)
-        if not guild:
-            return None
-        
-        for member in guild.members:
-            if member.display_name == username:
-                return member.id
-        
-        return None
-    
     @staticmethod
     async def get_voice_client(ctx: commands.Context, bot: commands.Bot) -> Optional[dc.VoiceClient]:
         """Get or create voice client for the context."""
@@ -49,17 +26,21 @@ class UserManager:
         return dc.utils.get(bot.voice_clients, guild=ctx.guild)
     
     @staticmethod
-    def user_can_modify_track(ctx: commands.Context, track_owner: str) -> bool:
+    def user_can_modify_track(ctx: commands.Context, track_owner: str, owner_id: Optional[int] = None) -> bool:
         """
         Check if user can modify a track (either owner or admin).
         
         Args:
             ctx: Command context
             track_owner: Username of track owner
+            owner_id: User ID of track owner, compared instead of the name when known
             
         Returns:
             True if user can modify, False otherwise
         """
         is_admin = ctx.author.guild_permissions.administrator
-        is_owner = track_owner == ctx.author.display_name
+        if owner_id is not None:
+            is_owner = owner_id == ctx.author.id
+        else:
+            is_owner = track_owner == ctx.author.display_name
         return is_admin or is_owner
\ No newline at end of file